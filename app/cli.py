@@ -1,12 +1,31 @@
-import subprocess
-import sys
+import os
+
+import uvicorn
 
 
 def main():
-    """Entry point for `backgrounder` CLI command."""
-    subprocess.run(
-        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
-        check=True,
+    """Entry point for `backgrounder` CLI command.
+
+    Runs uvicorn in-process on uvloop + httptools. Set BACKGROUNDER_DEV=1 to get
+    the auto-reloading dev server instead. Each worker is its own process with
+    its own HTTP client, caches and concurrency limits.
+    """
+    if os.getenv("BACKGROUNDER_DEV") == "1":
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+        return
+
+    # Behind nginx/Caddy, bind a Unix socket instead of a TCP port.
+    uds = os.getenv("BACKGROUNDER_UDS")
+    bind = {"uds": uds} if uds else {"host": "0.0.0.0", "port": 8000}
+
+    uvicorn.run(
+        "app.main:app",
+        **bind,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        proxy_headers=False,
+        workers=int(os.getenv("WEB_CONCURRENCY", "2")),
     )
 
 
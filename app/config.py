@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Literal
 from pydantic_settings import BaseSettings
 
@@ -7,11 +8,18 @@ class Settings(BaseSettings):
 
     # SerpAPI
     serpapi_api_key: str = ""
+    serpapi_max_concurrency: int = 15  # SerpAPI requests in flight at once, across all checks
+    serpapi_rate_limit: float = 20.0  # SerpAPI requests started per second, across all checks; 0 disables
+    serpapi_cache_ttl: int = 3600  # seconds an identical Google/News/company search is reused; 0 disables
 
     # Playwright
     linkedin_email: str = ""
     linkedin_password: str = ""
     playwright_headless: bool = True
+    playwright_prewarm: bool = False  # launch the browser and log in at startup instead of on first use
+    playwright_pool_size: int = 2  # browser contexts, i.e. LinkedIn pages scraped at once
+    playwright_state_dir: str = ""  # save/restore each context's cookies here so logins survive restarts
+    playwright_proxies: str = ""  # comma-separated proxy servers, assigned to contexts round-robin
 
     # Proxycurl
     proxycurl_api_key: str = ""
@@ -24,15 +32,36 @@ class Settings(BaseSettings):
     nvidia_api_key: str = ""
     nvidia_base_url: str = "https://integrate.api.nvidia.com/v1"
     nvidia_model: str = "meta/llama-3.1-70b-instruct"
+    llm_cache_ttl: int = 3600  # seconds to reuse an identical report; 0 disables
+    llm_context_tokens: int = 6000  # approx. token budget for collected data in the prompt; 0 = no limit
+    llm_structured_output: bool = False  # send a JSON schema (structured outputs) instead of plain JSON mode
+    llm_context_format: Literal["text", "json"] = "text"  # how collected data is rendered into the prompt
 
     # ImgBB (for reverse image search)
     imgbb_api_key: str = ""
 
     # General
     max_concurrency: int = 5
+    max_inflight_tasks: int = 12  # source tasks running at once across all checks (Playwright has its own cap)
     request_timeout: int = 30
+    http_max_connections: int = 50  # pooled connections across all hosts (HTTP/2 hosts need only one each)
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0  # seconds an idle pooled connection is kept open
+    source_cache_ttl: int = 3600  # seconds LinkedIn/GitHub/company lookups stay fresh; 0 disables
+    source_cache_stale: int = 86400  # extra seconds a stale lookup is served while it refreshes
 
-    model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
+    model_config = {
+        "env_file": ".env",
+        "env_file_encoding": "utf-8",
+        "frozen": True,
+        "extra": "ignore",
+    }
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load and validate settings once per process."""
+    return Settings()
+
+
+settings = get_settings()
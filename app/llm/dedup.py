@@ -0,0 +1,40 @@
+import re
+from collections.abc import Callable
+from hashlib import blake2b
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_WORD_RE = re.compile(r"\w+")
+_BITS = 64
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over the lower-cased words of `text`."""
+    weights = [0] * _BITS
+    for token in set(_WORD_RE.findall(text.lower())):
+        h = int.from_bytes(blake2b(token.encode(), digest_size=8).digest(), "big")
+        for bit in range(_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    out = 0
+    for bit, w in enumerate(weights):
+        if w > 0:
+            out |= 1 << bit
+    return out
+
+
+def dedup_snippets(items: list[T], max_distance: int = 6, key: Callable[[T], str] = str) -> list[T]:
+    """Drop items whose SimHash is within `max_distance` bits of an earlier kept item.
+
+    `key` picks the text to hash. Order is preserved, so the first (usually
+    highest-ranked) copy wins.
+    """
+    kept: list[T] = []
+    hashes: list[int] = []
+    for item in items:
+        h = simhash(key(item))
+        if any((h ^ k).bit_count() <= max_distance for k in hashes):
+            continue
+        hashes.append(h)
+        kept.append(item)
+    return kept
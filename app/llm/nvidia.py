@@ -1,11 +1,23 @@
-import json
+import asyncio
+import hashlib
 import logging
+from functools import lru_cache
+
+import httpx
+import orjson
+from pydantic import BaseModel
+
 from app.config import settings
-from app.models import BackgroundCheckRequest, AggregatedData
+from app.models import BackgroundCheckRequest, AggregatedData, BackgroundVerdict, IdentityVerification
+from app.utils.cache import TTLCache
 from app.utils.http import get_client
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever SYSTEM_PROMPT changes. Sent as `prompt_cache_key` so OpenAI-compatible
+# servers can reuse the KV cache of the (static) system prefix across requests.
+_PROMPT_VERSION = "bg_v1"
+
 SYSTEM_PROMPT = """\
 You are a professional background research analyst and due-diligence investigator. \
 Given data about a person collected from their resume, LinkedIn, GitHub, Google search, and news articles, \
@@ -62,60 +74,115 @@ For each claim, note whether it was VERIFIED, UNVERIFIED, or CONTRADICTED. Examp
 Be factual and objective. Do not invent information. If data is sparse, note it as a limitation. \
 Base the verdict ONLY on what the data shows — do not assume the worst or best."""
 
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+_JSON_FORMAT = {"type": "json_object"}
+
+
+class _ReportSchema(BaseModel):
+    """Shape of the report the model is asked for (mirrors SYSTEM_PROMPT)."""
+
+    summary: str
+    professional_background: str
+    key_highlights: list[str]
+    identity_verification: IdentityVerification
+    verdict: BackgroundVerdict
+
+
+_SCHEMA_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "background_report", "schema": _ReportSchema.model_json_schema()},
+}
+_TEMPERATURE = 0.3
+_CHARS_PER_TOKEN = 4  # rough average for English text with Llama-style tokenizers
+
+# Caps NVIDIA completions in flight across all concurrent checks (report + resume
+# extraction) so a burst of users cannot starve the shared connection pool.
+llm_slots = asyncio.Semaphore(settings.max_concurrency)
+
+# Parsed reports keyed by a hash of the full prompt. Sampling runs at a low
+# temperature, so re-running a check on the same data reuses the last report.
+_report_cache = TTLCache(maxsize=512, ttl=settings.llm_cache_ttl)
+
+
+@lru_cache(maxsize=1)
+def _completions_url() -> str:
+    return f"{settings.nvidia_base_url}/chat/completions"
+
+
+@lru_cache(maxsize=1)
+def _headers() -> dict[str, str]:
+    return {
+        "Authorization": f"Bearer {settings.nvidia_api_key}",
+        "Content-Type": "application/json",
+    }
+
 
 async def generate_report(
     request: BackgroundCheckRequest,
     aggregated: AggregatedData,
 ) -> dict:
-    user_message = f"Generate a background report and verdict for: {request.name}\n"
+    model = settings.nvidia_model
+    log = logger
+
+    parts = [f"Generate a background report and verdict for: {request.name}\n"]
     if request.company:
-        user_message += f"Company context: {request.company}\n"
+        parts.append(f"Company context: {request.company}\n")
     if request.title:
-        user_message += f"Title context: {request.title}\n"
+        parts.append(f"Title context: {request.title}\n")
     if request.location:
-        user_message += f"Location context: {request.location}\n"
-    user_message += f"\n--- Collected Data ---\n{aggregated.raw_context}\n--- End Data ---"
+        parts.append(f"Location context: {request.location}\n")
+    parts.append("\n--- Collected Data ---\n")
+    parts.extend(_context_chunks(aggregated.context_parts, settings.llm_context_tokens))
+    parts.append("\n--- End Data ---")
+    user_message = "".join(parts)
+
+    cache_key = None
+    if settings.llm_cache_ttl:
+        cache_key = hashlib.sha256(
+            orjson.dumps([model, SYSTEM_PROMPT, user_message, _TEMPERATURE, settings.llm_structured_output])
+        ).hexdigest()
+        cached = _report_cache.get(cache_key)
+        if cached is not None:
+            log.info("LLM report cache hit for %s", request.name)
+            return cached
 
     payload = {
-        "model": settings.nvidia_model,
-        "messages": [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-        "temperature": 0.3,
+        "model": model,
+        "messages": (_SYSTEM_MSG, {"role": "user", "content": user_message}),
+        "temperature": _TEMPERATURE,
         "max_tokens": 4000,
-        "response_format": {"type": "json_object"},
+        "response_format": _SCHEMA_FORMAT if settings.llm_structured_output else _JSON_FORMAT,
+        "prompt_cache_key": _PROMPT_VERSION,
+        "stream": True,
     }
 
     client = get_client()
-    resp = await client.post(
-        f"{settings.nvidia_base_url}/chat/completions",
-        json=payload,
-        headers={
-            "Authorization": f"Bearer {settings.nvidia_api_key}",
-            "Content-Type": "application/json",
-        },
-        timeout=60,
-    )
-
-    if resp.status_code != 200:
-        logger.error("NVIDIA API error %d: %s", resp.status_code, resp.text[:500])
+    async with llm_slots, client.stream(
+        "POST", _completions_url(), content=orjson.dumps(payload), headers=_headers(), timeout=60,
+    ) as resp:
+        if resp.status_code != 200:
+            if log.isEnabledFor(logging.ERROR):
+                await resp.aread()
+                log.error(
+                    "NVIDIA API error %d: %s", resp.status_code, resp.content[:500].decode("utf-8", "replace"),
+                )
+            return _fallback_report(request, aggregated)
+        content = await _read_stream(resp)
+    if not content:
+        log.warning("NVIDIA API stream for %s carried no content", request.name)
         return _fallback_report(request, aggregated)
 
-    data = resp.json()
-    content = data["choices"][0]["message"]["content"]
-
     try:
-        parsed = json.loads(content)
-        return {
+        parsed = orjson.loads(content)
+        report = {
             "summary": parsed.get("summary", ""),
             "professional_background": parsed.get("professional_background", ""),
             "key_highlights": parsed.get("key_highlights", []),
             "identity_verification": parsed.get("identity_verification"),
             "verdict": parsed.get("verdict"),
         }
-    except (json.JSONDecodeError, KeyError, IndexError) as e:
-        logger.warning("Failed to parse LLM JSON: %s. Raw: %s", e, content[:300])
+    except (orjson.JSONDecodeError, KeyError, IndexError) as e:
+        log.warning("Failed to parse LLM JSON: %s. Raw: %s", e, content[:300])
         return {
             "summary": content[:1000],
             "professional_background": "",
@@ -124,13 +191,71 @@ async def generate_report(
             "verdict": None,
         }
 
+    if cache_key:
+        _report_cache.set(cache_key, report)
+    return report
+
+
+def _context_chunks(blocks: list[str], budget: int) -> list[str]:
+    """Context blocks interleaved with blank lines, ready to join into the prompt once.
+
+    Only an over-budget context is joined up front so `_clip` can cut it.
+    """
+    if budget and sum(map(len, blocks)) + 2 * len(blocks) > budget * _CHARS_PER_TOKEN:
+        return [_clip("\n\n".join(blocks), budget)]
+    chunks = []
+    for block in blocks:
+        chunks.append(block)
+        chunks.append("\n\n")
+    return chunks[:-1]
+
+
+def _clip(text: str, budget: int) -> str:
+    """Keep the head and tail of `text` within roughly `budget` tokens (0 = no limit)."""
+    limit = budget * _CHARS_PER_TOKEN
+    if not budget or len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n[... collected data truncated ...]\n{text[-half:]}"
+
+
+async def _read_stream(resp: httpx.Response) -> str:
+    """Join the content deltas of a streamed (SSE) chat completion.
+
+    Undecodable frames are skipped; an error frame ends the stream.
+    """
+    parts = []
+    async for line in resp.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        chunk = line[5:].strip()
+        if chunk == "[DONE]":
+            break
+        try:
+            frame = orjson.loads(chunk)
+        except orjson.JSONDecodeError:
+            logger.warning("Skipping malformed LLM stream frame: %s", chunk[:200])
+            continue
+        if not isinstance(frame, dict):
+            continue
+        if frame.get("error"):
+            logger.error("NVIDIA API stream error: %s", str(frame["error"])[:500])
+            break
+        choices = frame.get("choices") or ()
+        if choices:
+            delta = choices[0].get("delta") or {}
+            if delta.get("content"):
+                parts.append(delta["content"])
+    return "".join(parts)
+
 
 def _fallback_report(request: BackgroundCheckRequest, aggregated: AggregatedData) -> dict:
+    raw = aggregated.raw_context
     return {
         "summary": f"Background data collected for {request.name} but LLM summarization failed.",
-        "professional_background": aggregated.raw_context[:2000] if aggregated.raw_context else "",
+        "professional_background": raw[:2000] if raw else "",
         "key_highlights": [
-            f"LinkedIn profile: {'found' if aggregated.linkedin else 'not found'}",
+            "LinkedIn profile: found" if aggregated.linkedin else "LinkedIn profile: not found",
             f"GitHub profiles: {len(aggregated.github_profiles)} found",
             f"Google results: {len(aggregated.search_results)} found",
             f"News articles: {len(aggregated.news_articles)} found",
@@ -1,25 +1,61 @@
+import asyncio
 import logging
+import sys
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from app.config import settings
 from app.routes import background_check
-from app.utils.http import close_client
+from app.utils.http import close_client, get_client
 
 STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+_SCRAPER_MODULE = "app.providers.playwright_scraper"
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logging.basicConfig(level=logging.INFO)
+    get_client()  # one pooled client per worker, shared by every provider and source
+    # In the background so startup isn't blocked
+    warmups = [asyncio.create_task(_prewarm_connections())]
+    if settings.playwright_prewarm:
+        warmups.append(asyncio.create_task(_prewarm_browser()))
     yield
+    for warmup in warmups:
+        warmup.cancel()
     await close_client()
+    scraper = sys.modules.get(_SCRAPER_MODULE)  # only if something imported it
+    if scraper:
+        try:
+            await scraper.close_browser()
+        except Exception:
+            pass
+
+
+async def _prewarm_browser():
     try:
-        from app.providers.playwright_scraper import close_browser
-        await close_browser()
-    except Exception:
-        pass
+        from app.providers.playwright_scraper import prewarm_browser
+    except ImportError as e:
+        logger.warning("Playwright unavailable, scraping disabled: %s", e)
+        return
+    await prewarm_browser()
+
+
+async def _prewarm_connections():
+    """Open pooled connections to the APIs every check uses, so the first check skips DNS + TLS."""
+    urls = []
+    if settings.serpapi_api_key:
+        urls.append("https://serpapi.com/")
+    if settings.nvidia_api_key:
+        urls.append(settings.nvidia_base_url)
+    client = get_client()
+    results = await asyncio.gather(*(client.head(url, timeout=2.0) for url in urls), return_exceptions=True)
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.info("Connection prewarm for %s failed: %s", url, result)
 
 
 def create_app() -> FastAPI:
@@ -34,10 +70,9 @@ def create_app() -> FastAPI:
         tags=["Background Check"],
     )
     app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-
-    @app.get("/")
-    async def root():
-        return FileResponse(str(STATIC_DIR / "index.html"))
+    # An exact "/" route rather than a catch-all mount, so unknown paths still 404 and
+    # trailing-slash API calls keep their redirect; html=True serves index.html
+    app.add_route("/", StaticFiles(directory=str(STATIC_DIR), html=True), name="frontend")
 
     return app
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -34,8 +34,8 @@ class ResumeData(BaseModel):
     github_url: Optional[str] = None
     website: Optional[str] = None
     skills: list[str] = Field(default_factory=list)
-    experience: list[dict] = Field(default_factory=list)
-    education: list[dict] = Field(default_factory=list)
+    experience: list[dict[str, Any]] = Field(default_factory=list)
+    education: list[dict[str, Any]] = Field(default_factory=list)
     certifications: list[str] = Field(default_factory=list)
     key_search_terms: list[str] = Field(default_factory=list)
     raw_text: Optional[str] = None
@@ -47,10 +47,10 @@ class LinkedInProfile(BaseModel):
     headline: Optional[str] = None
     location: Optional[str] = None
     summary: Optional[str] = None
-    experience: list[dict] = Field(default_factory=list)
-    education: list[dict] = Field(default_factory=list)
+    experience: list[dict[str, Any]] = Field(default_factory=list)
+    education: list[dict[str, Any]] = Field(default_factory=list)
     skills: list[str] = Field(default_factory=list)
-    certifications: list[dict] = Field(default_factory=list)
+    certifications: list[dict[str, Any]] = Field(default_factory=list)
     raw_text: Optional[str] = None
 
 
@@ -72,14 +72,14 @@ class GitHubProfile(BaseModel):
     public_repos: int = 0
     followers: int = 0
     following: int = 0
-    top_repos: list[dict] = Field(default_factory=list)
+    top_repos: list[dict[str, Any]] = Field(default_factory=list)
 
 
 class IdentityVerification(BaseModel):
     confidence: str = ""  # "high", "medium", "low"
     reasoning: str = ""
     multiple_people_detected: bool = False
-    profiles_found: list[dict] = Field(default_factory=list)
+    profiles_found: list[dict[str, Any]] = Field(default_factory=list)
     cross_reference_notes: list[str] = Field(default_factory=list)
 
 
@@ -134,7 +134,11 @@ class AggregatedData(BaseModel):
     reference_contacts: list[ReferenceContact] = Field(default_factory=list)
     search_results: list[SearchResult] = Field(default_factory=list)
     news_articles: list[SearchResult] = Field(default_factory=list)
-    raw_context: str = ""
+    context_parts: list[str] = Field(default_factory=list)  # LLM context blocks, in prompt order
+
+    @property
+    def raw_context(self) -> str:
+        return "\n\n".join(self.context_parts)
 
 
 class BackgroundReport(BaseModel):
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from app.models import SearchResult, SocialProfile
+
+
+@dataclass(slots=True)
+class SearchResultRaw:
+    """Unvalidated search hit built by the sources; becomes a SearchResult only if it reaches the report."""
+
+    title: str
+    url: str
+    snippet: str
+    source: str
+
+    def to_model(self) -> SearchResult:
+        return SearchResult.model_construct(
+            title=self.title, url=self.url, snippet=self.snippet, source=self.source,
+        )
+
+
+@dataclass(slots=True)
+class SocialProfileRaw:
+    """Unvalidated social hit built while scanning; deduped, then turned into a SocialProfile."""
+
+    platform: str
+    url: str
+    username: str | None
+    snippet: str
+
+    def to_model(self) -> SocialProfile:
+        return SocialProfile.model_construct(
+            platform=self.platform, url=self.url, username=self.username, snippet=self.snippet,
+        )
@@ -1,24 +1,61 @@
 import asyncio
 import logging
+import weakref
 from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
+import orjson
+from pydantic import BaseModel, ValidationError
+
+from app.config import settings
 from app.models import (
     BackgroundCheckRequest, BackgroundReport, AggregatedData,
     LinkedInProfile, GitHubProfile, ResumeData, IdentityVerification,
-    BackgroundVerdict, SearchResult, CompanyCheck, SocialProfile, PhotoMatch,
-    ReferenceContact,
+    BackgroundVerdict, SearchResult, PhotoMatch, ReferenceContact,
 )
 from app.providers.base import LinkedInProvider
+from app.providers.factory import get_provider
 from app.sources.google_search import search_google_query, search_news_query
 from app.sources.github import search_github_query, fetch_github_user, extract_github_username
 from app.sources.company_verify import verify_companies
 from app.sources.social_media import scan_social_media
 from app.sources.photo_search import reverse_photo_search
 from app.sources.reference_discovery import discover_references
+from app.llm.dedup import dedup_snippets
 from app.llm.nvidia import generate_report
+from app.utils.cache import SWRCache
 
 logger = logging.getLogger(__name__)
 
+# Profile lookups change rarely; repeated checks of the same person reuse them.
+_source_cache = SWRCache(
+    maxsize=256, ttl=settings.source_cache_ttl, stale=settings.source_cache_stale,
+)
+
+
+# Shared by every running check so a burst of users queues instead of thrashing the loop.
+_inflight = asyncio.Semaphore(settings.max_inflight_tasks)
+
+
+def _cached(key: tuple, factory):
+    """Await `factory()` through the source cache (or directly when caching is off).
+
+    Background refreshes get the same `_TASK_TIMEOUTS` budget as the source (key[0]).
+    """
+    if not settings.source_cache_ttl:
+        return factory()
+    timeout = _TASK_TIMEOUTS.get(key[0].split(":", 1)[0], _DEFAULT_TASK_TIMEOUT)
+    return _source_cache.get_or_fetch(key, factory, timeout)
+
+
+def _fetch_linkedin(provider: LinkedInProvider, request: BackgroundCheckRequest):
+    if request.linkedin_url:
+        who = (request.linkedin_url.lower().rstrip("/"),)
+    else:
+        who = tuple((v or "").lower() for v in (request.name, request.company, request.title, request.location))
+    return _cached(("linkedin", provider.PROVIDER_KEY, *who), lambda: provider.fetch_profile(request))
+
 
 def _build_search_queries(request: BackgroundCheckRequest, resume: ResumeData | None) -> dict:
     """
@@ -51,12 +88,18 @@ def _build_search_queries(request: BackgroundCheckRequest, resume: ResumeData |
 
     if resume:
         # Google: name + each PAST company (not current, we already have that)
-        past_companies = set()
+        # In resume order (most recent first) so query labels are stable between runs
+        past_companies = []
+        seen = {(request.company or "").strip().lower()}
         for exp in resume.experience:
             co = exp.get("company", "").strip()
-            if co and co.lower() != (request.company or "").lower():
-                past_companies.add(co)
-        for co in list(past_companies)[:3]:
+            key = co.lower()
+            if co and key not in seen:
+                seen.add(key)
+                past_companies.append(co)
+                if len(past_companies) == 3:
+                    break
+        for co in past_companies:
             tasks[f"google:company:{co}"] = ("google", f'"{name}" "{co}"')
 
         # Google: name + each school
@@ -81,10 +124,31 @@ def _build_search_queries(request: BackgroundCheckRequest, resume: ResumeData |
             tasks["github:company"] = ("github_search", f"{name} {resume.company}")
 
         # News: name + past companies
-        for co in list(past_companies)[:2]:
+        for co in past_companies[:2]:
             tasks[f"news:company:{co}"] = ("news", f"{name} {co}")
 
-    return tasks
+    # Drop queries that differ only in case or spacing — each one is a paid API call.
+    unique = {}
+    seen = set()
+    for label, (task_type, query) in tasks.items():
+        key = (task_type, _canonical_query(query))
+        if key not in seen:
+            seen.add(key)
+            unique[label] = (task_type, query)
+    return unique
+
+
+def _canonical_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _normalize_url(url: str) -> str:
+    """Dedup key for a result URL: lower-cased host, no utm_* params, fragment or trailing slash."""
+    parts = urlsplit(url)
+    query = parts.query
+    if "utm_" in query:
+        query = urlencode([(k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not k.startswith("utm_")])
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
 
 
 async def _run_task(task_type: str, query: str) -> tuple[str, list]:
@@ -99,11 +163,69 @@ async def _run_task(task_type: str, query: str) -> tuple[str, list]:
         results = await search_github_query(query)
         return ("github", results)
     elif task_type == "github_direct":
-        profile = await fetch_github_user(query)
+        profile = await _cached(("github:user", query.lower()), lambda: fetch_github_user(query))
         return ("github", [profile] if profile else [])
     return ("unknown", [])
 
 
+# A primary LinkedIn profile scoring at least this much (e.g. name + headline +
+# location + one role) is complete enough that the fallback providers are skipped.
+_LINKEDIN_GOOD_ENOUGH = 6
+
+# Result of a fallback task that was not needed; shown as "skipped" in the activity feed.
+_SKIPPED = object()
+
+
+def _score_linkedin(p: LinkedInProfile) -> int:
+    score = 0
+    if p.name:
+        score += 1
+    if p.headline:
+        score += 1
+    if p.summary:
+        score += 2
+    if p.location:
+        score += 1
+    score += len(p.experience) * 3
+    score += len(p.education) * 2
+    score += len(p.skills)
+    return score
+
+
+async def _linkedin_fallback(primary: asyncio.Future, factory, limited: bool):
+    """Run a secondary LinkedIn provider only if the primary one came back thin."""
+    try:
+        profile = await asyncio.shield(primary)
+    except asyncio.CancelledError:
+        if not primary.cancelled():  # we were cancelled ourselves
+            raise
+        profile = None  # the primary timed out
+    except Exception:
+        profile = None
+    if profile is not None and _score_linkedin(profile) >= _LINKEDIN_GOOD_ENOUGH:
+        return _SKIPPED
+    # The wait above is unbounded; the fallback itself gets the usual LinkedIn budget
+    async with asyncio.timeout(_TASK_TIMEOUTS["linkedin"]):
+        if limited:
+            async with _inflight:
+                return await factory()
+        return await factory()
+
+
+async def _publish(future: asyncio.Future, coro):
+    """Await `coro` and mirror its outcome onto `future` for the tasks waiting on it."""
+    try:
+        result = await coro
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    future.set_result(result)
+    return result
+
+
 def _pick_best_linkedin(profiles: list[LinkedInProfile | None]) -> LinkedInProfile | None:
     """Pick the LinkedIn profile with the most data from multiple provider results."""
     best = None
@@ -111,18 +233,7 @@ def _pick_best_linkedin(profiles: list[LinkedInProfile | None]) -> LinkedInProfi
     for p in profiles:
         if p is None:
             continue
-        score = 0
-        if p.name:
-            score += 1
-        if p.headline:
-            score += 1
-        if p.summary:
-            score += 2
-        if p.location:
-            score += 1
-        score += len(p.experience) * 3
-        score += len(p.education) * 2
-        score += len(p.skills)
+        score = _score_linkedin(p)
         if score > best_score:
             best_score = score
             best = p
@@ -133,331 +244,235 @@ async def run_pipeline(
     request: BackgroundCheckRequest,
     linkedin_provider: LinkedInProvider,
     resume_data: ResumeData | None = None,
+    photo_url: str | None = None,
 ) -> BackgroundReport:
+    """Run every source concurrently and return the finished report (no progress events)."""
+    tasks, linkedin_labels, search_labels = _build_tasks(request, linkedin_provider, resume_data, photo_url)
+    logger.info("Running %d concurrent tasks", len(tasks))
 
-    # Build all concurrent tasks
-    search_tasks = _build_search_queries(request, resume_data)
-
-    # --- LinkedIn: run ALL providers concurrently ---
-    # Always run the user's chosen provider
-    linkedin_coros = [
-        _safe_fetch(linkedin_provider.fetch_profile(request), "linkedin:chosen"),
-    ]
-    linkedin_labels = [type(linkedin_provider).__name__]
-
-    # Always also run Playwright if we have a direct URL (from resume or form)
-    linkedin_url = request.linkedin_url or (resume_data.linkedin_url if resume_data else None)
-    from app.providers.playwright_scraper import PlaywrightProvider
-    from app.providers.serpapi import SerpAPIProvider
-
-    if linkedin_url:
-        # Make a request copy with the URL set
-        li_req = request.model_copy(update={"linkedin_url": linkedin_url})
-
-        # Run Playwright on the direct URL (if not already the chosen provider)
-        if not isinstance(linkedin_provider, PlaywrightProvider):
-            linkedin_coros.append(
-                _safe_fetch(PlaywrightProvider().fetch_profile(li_req), "linkedin:playwright"),
-            )
-            linkedin_labels.append("PlaywrightProvider")
-
-        # Run SerpAPI on the direct URL too (if not already the chosen provider)
-        if not isinstance(linkedin_provider, SerpAPIProvider):
-            linkedin_coros.append(
-                _safe_fetch(SerpAPIProvider().fetch_profile(li_req), "linkedin:serpapi"),
-            )
-            linkedin_labels.append("SerpAPIProvider")
-    else:
-        # No URL — still try Playwright and SerpAPI by name search
-        if not isinstance(linkedin_provider, PlaywrightProvider):
-            linkedin_coros.append(
-                _safe_fetch(PlaywrightProvider().fetch_profile(request), "linkedin:playwright"),
-            )
-            linkedin_labels.append("PlaywrightProvider")
-        if not isinstance(linkedin_provider, SerpAPIProvider):
-            linkedin_coros.append(
-                _safe_fetch(SerpAPIProvider().fetch_profile(request), "linkedin:serpapi"),
-            )
-            linkedin_labels.append("SerpAPIProvider")
-
-    # --- Prepare all other search coroutines ---
-    other_coros = []
-    other_names = []
-    for name, (task_type, query) in search_tasks.items():
-        other_coros.append(_safe_fetch(_run_task(task_type, query), name))
-        other_names.append(name)
-
-    # --- Company verification + Social media scan (concurrent) ---
-    extra_coros = []
-    extra_labels = []
-
-    # Company verification (if resume provided)
-    if resume_data:
-        extra_coros.append(_safe_fetch(verify_companies(resume_data), "company_verify"))
-        extra_labels.append("company_verify")
-
-    # Social media scan (always)
-    extra_coros.append(_safe_fetch(scan_social_media(request), "social_media"))
-    extra_labels.append("social_media")
-
-    total = len(linkedin_coros) + len(other_coros) + len(extra_coros)
-    logger.info(
-        "Running %d concurrent tasks: %d LinkedIn + %d searches + %d extras",
-        total, len(linkedin_coros), len(other_coros), len(extra_coros),
-    )
-
-    # Run EVERYTHING concurrently
-    all_results = await asyncio.gather(*(linkedin_coros + other_coros + extra_coros))
-
-    # Split results
-    li_count = len(linkedin_coros)
-    other_count = len(other_coros)
-    li_results = all_results[:li_count]
-    other_results = all_results[li_count:li_count + other_count]
-    extra_results = all_results[li_count + other_count:]
-
-    # Parse extra results
-    company_checks: list[CompanyCheck] = []
-    social_profiles: list[SocialProfile] = []
-    for i, result in enumerate(extra_results):
-        label = extra_labels[i]
-        if result is None:
-            continue
-        if label == "company_verify":
-            company_checks = result
-        elif label == "social_media":
-            social_profiles = result
-
-    # Pick best LinkedIn profile
-    linkedin_profile = _pick_best_linkedin(li_results)
-    li_providers_used = []
-    for i, r in enumerate(li_results):
-        if r is not None:
-            li_providers_used.append(linkedin_labels[i])
-
-    # Collect search results by type
-    all_google: list[SearchResult] = []
-    all_news: list[SearchResult] = []
-    all_github: list[GitHubProfile] = []
-    seen_urls = set()
-    seen_github_usernames = set()
-
-    for i, result in enumerate(other_results):
-        if result is None:
-            continue
-        task_name = other_names[i]
-        result_type, items = result if isinstance(result, tuple) else ("unknown", [])
-
-        if result_type == "google":
-            for item in items:
-                if item.url not in seen_urls:
-                    seen_urls.add(item.url)
-                    item.source = f"google ({task_name.split(':', 1)[-1]})"
-                    all_google.append(item)
-        elif result_type == "news":
-            for item in items:
-                if item.url not in seen_urls:
-                    seen_urls.add(item.url)
-                    all_news.append(item)
-        elif result_type == "github":
-            for profile in items:
-                if profile.username not in seen_github_usernames:
-                    seen_github_usernames.add(profile.username)
-                    all_github.append(profile)
-
-    # Build raw context for LLM
-    sources_used = []
-    raw_parts = []
-
-    if resume_data:
-        sources_used.append("Resume (uploaded)")
-        raw_parts.append(_resume_to_text(resume_data))
-
-    if linkedin_profile:
-        providers_str = " + ".join(li_providers_used)
-        sources_used.append(f"LinkedIn ({providers_str})")
-        raw_parts.append(_linkedin_to_text(linkedin_profile))
-
-    if all_github:
-        sources_used.append(f"GitHub ({len(all_github)} profiles found)")
-        for i, gh in enumerate(all_github):
-            raw_parts.append(_github_to_text(gh, i + 1))
+    results_map = {}
+    for future in asyncio.as_completed(tasks):
+        label, result = await future
+        results_map[label] = result
 
-    if all_google:
-        sources_used.append(f"Google Search ({len(all_google)} results)")
-        for r in all_google:
-            raw_parts.append(f"[{r.source}] {r.title}: {r.snippet}")
+    return await _assemble_report(request, linkedin_provider, resume_data, results_map, linkedin_labels, search_labels)
 
-    if all_news:
-        sources_used.append(f"Google News ({len(all_news)} articles)")
-        for r in all_news:
-            raw_parts.append(f"[news] {r.title}: {r.snippet}")
 
-    if company_checks:
-        sources_used.append(f"Company Verification ({len(company_checks)} checked)")
-        for cc in company_checks:
-            status = "VERIFIED" if cc.verified else "NOT VERIFIED"
-            raw_parts.append(f"[company check] {cc.name}: {status} — {cc.description}")
+# === Text serializers for LLM context ===
 
-    if social_profiles:
-        sources_used.append(f"Social Media ({len(social_profiles)} profiles found)")
-        for sp in social_profiles:
-            raw_parts.append(f"[social: {sp.platform}] {sp.url} — {sp.snippet}")
+def _text_context(agg: AggregatedData) -> list[str]:
+    """One human-readable block per source item, in prompt order."""
+    parts = []
+    add = parts.append
+    if agg.resume:
+        add(_resume_to_text(agg.resume))
+    if agg.linkedin:
+        add(_linkedin_to_text(agg.linkedin))
+    for i, gh in enumerate(agg.github_profiles):
+        add(_github_to_text(gh, i + 1))
+    for r in dedup_snippets(agg.search_results, key=_snippet_text):
+        add(f"[{r.source}] {r.title}: {_truncate(r.snippet)}")
+    for r in dedup_snippets(agg.news_articles, key=_snippet_text):
+        add(f"[news] {r.title}: {_truncate(r.snippet)}")
+    for cc in agg.company_checks:
+        add(f"[company] {cc.name}: {'VERIFIED' if cc.verified else 'NOT VERIFIED'} — {cc.description}")
+    for sp in agg.social_profiles:
+        add(f"[social: {sp.platform}] {sp.url} — {sp.snippet}")
+    for pm in agg.photo_matches:
+        platform_tag = f" [{pm.platform}]" if pm.platform else ""
+        add(f"[photo match{platform_tag}] {pm.url} — {pm.title}")
+    for rc in agg.reference_contacts:
+        add(f"[reference: {rc.category}] {rc.name} — {rc.title} at {rc.company} ({rc.linkedin_url})")
+    return parts
+
+
+def _json_context(agg: AggregatedData) -> list[str]:
+    """The same data as one compact JSON document (LLM_CONTEXT_FORMAT=json)."""
+    linkedin = None
+    if agg.linkedin:
+        # Raw page text is only useful when structured extraction failed
+        exclude = {"raw_text"} if agg.linkedin.experience else set()
+        linkedin = agg.linkedin.model_dump(exclude=exclude, exclude_defaults=True)
+        if "raw_text" in linkedin:
+            linkedin["raw_text"] = linkedin["raw_text"][:3000]
+    data = {
+        "resume": agg.resume.model_dump(exclude={"raw_text"}, exclude_defaults=True) if agg.resume else None,
+        "linkedin": linkedin,
+        "github": [gh.model_dump(exclude_defaults=True) for gh in agg.github_profiles],
+        "google": [
+            {"source": r.source, "title": r.title, "snippet": _truncate(r.snippet)}
+            for r in dedup_snippets(agg.search_results, key=_snippet_text)
+        ],
+        "news": [
+            {"title": r.title, "snippet": _truncate(r.snippet)}
+            for r in dedup_snippets(agg.news_articles, key=_snippet_text)
+        ],
+        "company_checks": [cc.model_dump(exclude_none=True) for cc in agg.company_checks],
+        "social_profiles": [sp.model_dump(exclude_none=True) for sp in agg.social_profiles],
+        "photo_matches": [pm.model_dump(exclude={"thumbnail"}, exclude_none=True) for pm in agg.photo_matches],
+        "references": [rc.model_dump(exclude_none=True) for rc in agg.reference_contacts],
+    }
+    return [orjson.dumps({k: v for k, v in data.items() if v}).decode()]
+
+
+def _memoized(render):
+    """Cache `render(model)` per model instance for as long as that instance is alive.
+
+    Cached LinkedIn/GitHub profiles are shared across checks, so their text is built once.
+    Keyed on id() because pydantic models are unhashable; a finalizer drops the entry.
+    """
+    memo: dict[int, str] = {}
 
-    aggregated = AggregatedData(
-        linkedin=linkedin_profile,
-        github_profiles=all_github,
-        resume=resume_data,
-        company_checks=company_checks,
-        social_profiles=social_profiles,
-        search_results=all_google,
-        news_articles=all_news,
-        raw_context="\n\n".join(raw_parts),
-    )
+    @wraps(render)
+    def wrapper(model):
+        key = id(model)
+        text = memo.get(key)
+        if text is None:
+            text = memo[key] = render(model)
+            weakref.finalize(model, memo.pop, key, None)
+        return text
 
-    confidence = ""
-    if not linkedin_profile:
-        confidence = "No LinkedIn profile found. Report is based on web search results only."
-    elif linkedin_profile.raw_text and not linkedin_profile.experience:
-        confidence = "LinkedIn data was partially extracted. Some details may be missing."
+    return wrapper
 
-    llm_result = await generate_report(request, aggregated)
 
-    identity_raw = llm_result.get("identity_verification")
-    identity = None
-    if identity_raw and isinstance(identity_raw, dict):
-        identity = IdentityVerification(
-            confidence=identity_raw.get("confidence", ""),
-            reasoning=identity_raw.get("reasoning", ""),
-            multiple_people_detected=identity_raw.get("multiple_people_detected", False),
-            profiles_found=identity_raw.get("profiles_found", []),
-            cross_reference_notes=identity_raw.get("cross_reference_notes", []),
-        )
+# Search snippets past this length are mostly boilerplate; the title + opening carry the signal.
+_SNIPPET_CHARS = 180
 
-    # Build verdict from LLM output
-    verdict_raw = llm_result.get("verdict")
-    verdict = None
-    if verdict_raw and isinstance(verdict_raw, dict):
-        verdict = BackgroundVerdict(
-            rating=verdict_raw.get("rating", ""),
-            score=verdict_raw.get("score", 0),
-            summary=verdict_raw.get("summary", ""),
-            resume_vs_online=verdict_raw.get("resume_vs_online", []),
-            red_flags=verdict_raw.get("red_flags", []),
-            green_flags=verdict_raw.get("green_flags", []),
-            recommendations=verdict_raw.get("recommendations", []),
-        )
 
-    providers_str = " + ".join(li_providers_used) if li_providers_used else type(linkedin_provider).__name__
+def _snippet_text(result: SearchResult) -> str:
+    return f"{result.title} {result.snippet}"
 
-    return BackgroundReport(
-        name=request.name,
-        generated_at=datetime.now(timezone.utc),
-        linkedin_profile=linkedin_profile,
-        github_profiles=all_github,
-        resume_data=resume_data,
-        company_checks=company_checks,
-        social_profiles=social_profiles,
-        identity_verification=identity,
-        verdict=verdict,
-        summary=llm_result.get("summary", ""),
-        professional_background=llm_result.get("professional_background", ""),
-        key_highlights=llm_result.get("key_highlights", []),
-        news_mentions=all_news,
-        sources_used=sources_used,
-        provider_used=providers_str,
-        confidence_note=confidence,
-    )
 
+def _truncate(text: str, limit: int = _SNIPPET_CHARS) -> str:
+    return text[:limit] + "…" if len(text) > limit else text
 
-# === Text serializers for LLM context ===
 
+@_memoized
 def _resume_to_text(resume: ResumeData) -> str:
     parts = ["[SOURCE: Uploaded Resume]"]
+    add = parts.append
     if resume.name:
-        parts.append(f"Name: {resume.name}")
+        add(f"Name: {resume.name}")
     if resume.title:
-        parts.append(f"Current Title: {resume.title}")
+        add(f"Current Title: {resume.title}")
     if resume.company:
-        parts.append(f"Current Company: {resume.company}")
+        add(f"Current Company: {resume.company}")
     if resume.location:
-        parts.append(f"Location: {resume.location}")
+        add(f"Location: {resume.location}")
     if resume.email:
-        parts.append(f"Email: {resume.email}")
+        add(f"Email: {resume.email}")
     if resume.linkedin_url:
-        parts.append(f"LinkedIn: {resume.linkedin_url}")
+        add(f"LinkedIn: {resume.linkedin_url}")
     if resume.github_url:
-        parts.append(f"GitHub: {resume.github_url}")
+        add(f"GitHub: {resume.github_url}")
     if resume.website:
-        parts.append(f"Website: {resume.website}")
+        add(f"Website: {resume.website}")
     if resume.skills:
-        parts.append(f"Skills: {', '.join(resume.skills[:20])}")
+        add(f"Skills: {', '.join(resume.skills[:20])}")
     for exp in resume.experience:
-        parts.append(
+        add(
             f"Experience: {exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')})"
         )
         if exp.get("description"):
-            parts.append(f"  Details: {exp['description'][:200]}")
+            add(f"  Details: {exp['description'][:200]}")
     for edu in resume.education:
-        parts.append(f"Education: {edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('school', '')}")
+        add(f"Education: {edu.get('degree', '')} in {edu.get('field', '')} from {edu.get('school', '')}")
     if resume.certifications:
-        parts.append(f"Certifications: {', '.join(resume.certifications)}")
+        add(f"Certifications: {', '.join(resume.certifications)}")
     if resume.key_search_terms:
-        parts.append(f"Key identifiers from resume: {', '.join(resume.key_search_terms)}")
+        add(f"Key identifiers from resume: {', '.join(resume.key_search_terms)}")
     return "\n".join(parts)
 
 
+@_memoized
 def _linkedin_to_text(profile: LinkedInProfile) -> str:
     parts = ["[SOURCE: LinkedIn]", f"Name: {profile.name}"]
+    add = parts.append
     if profile.headline:
-        parts.append(f"Headline: {profile.headline}")
+        add(f"Headline: {profile.headline}")
     if profile.location:
-        parts.append(f"Location: {profile.location}")
+        add(f"Location: {profile.location}")
     if profile.summary:
-        parts.append(f"About: {profile.summary}")
+        add(f"About: {profile.summary}")
     for exp in profile.experience:
-        parts.append(
+        add(
             f"Experience: {exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')})"
         )
     for edu in profile.education:
-        parts.append(f"Education: {edu.get('degree', '')} from {edu.get('school', '')}")
+        add(f"Education: {edu.get('degree', '')} from {edu.get('school', '')}")
     if profile.skills:
-        parts.append(f"Skills: {', '.join(profile.skills[:15])}")
+        add(f"Skills: {', '.join(profile.skills[:15])}")
     if profile.raw_text and not profile.experience:
-        parts.append(f"Raw profile text:\n{profile.raw_text[:3000]}")
+        add(f"Raw profile text:\n{profile.raw_text[:3000]}")
     return "\n".join(parts)
 
 
 def _github_to_text(profile: GitHubProfile, index: int) -> str:
-    parts = [f"[SOURCE: GitHub Profile #{index}]"]
-    parts.append(f"Username: {profile.username}")
+    return f"[SOURCE: GitHub Profile #{index}]\n{_github_body(profile)}"
+
+
+@_memoized
+def _github_body(profile: GitHubProfile) -> str:
+    parts = [f"Username: {profile.username}"]
+    add = parts.append
     if profile.name:
-        parts.append(f"Display Name: {profile.name}")
+        add(f"Display Name: {profile.name}")
     if profile.bio:
-        parts.append(f"Bio: {profile.bio}")
+        add(f"Bio: {profile.bio}")
     if profile.company:
-        parts.append(f"Company: {profile.company}")
+        add(f"Company: {profile.company}")
     if profile.location:
-        parts.append(f"Location: {profile.location}")
+        add(f"Location: {profile.location}")
     if profile.blog:
-        parts.append(f"Website: {profile.blog}")
-    parts.append(f"Public Repos: {profile.public_repos}, Followers: {profile.followers}")
+        add(f"Website: {profile.blog}")
+    add(f"Public Repos: {profile.public_repos}, Followers: {profile.followers}")
     if profile.top_repos:
-        repo_strs = []
-        for r in profile.top_repos:
-            repo_strs.append(
-                f"  - {r.get('name', '')} ({r.get('language', 'N/A')}, "
-                f"{r.get('stars', 0)} stars): {r.get('description', '')}"
-            )
-        parts.append("Top Repositories:\n" + "\n".join(repo_strs))
+        add("Top Repositories:")
+        parts.extend(
+            f"  - {r.get('name', '')} ({r.get('language', 'N/A')}, "
+            f"{r.get('stars', 0)} stars): {r.get('description', '')}"
+            for r in profile.top_repos
+        )
     return "\n".join(parts)
 
 
-async def _labeled_task(coro, label: str):
-    """Wrap a coroutine so it returns (label, result) and catches errors."""
+# Upper bound (seconds) per source, keyed on the label prefix. Generous on purpose:
+# it only exists so one hung upstream cannot hold the whole report hostage.
+_TASK_TIMEOUTS = {
+    "linkedin": 60,
+    "google": 20,
+    "news": 20,
+    "github": 20,
+    "company_verify": 30,
+    "social_media": 45,
+    "references": 45,
+    "photo_search": 45,
+}
+_DEFAULT_TASK_TIMEOUT = 45
+
+
+async def _labeled_task(coro, label: str, limited: bool = True, timed: bool = True):
+    """Wrap a coroutine so it returns (label, result) and catches errors and timeouts.
+
+    Runs under the global in-flight limit unless `limited` is False (Playwright,
+    which is capped by its browser context pool), and within the `_TASK_TIMEOUTS`
+    budget for its label prefix unless `timed` is False. `coro` may also be a
+    zero-argument factory, called only once the slot is held.
+    """
+    timeout = _TASK_TIMEOUTS.get(label.split(":", 1)[0], _DEFAULT_TASK_TIMEOUT) if timed else None
     try:
-        result = await coro
+        if limited:
+            async with _inflight:
+                logger.debug("Source '%s' started", label)
+                async with asyncio.timeout(timeout):
+                    result = await (coro() if callable(coro) else coro)
+        else:
+            async with asyncio.timeout(timeout):
+                result = await (coro() if callable(coro) else coro)
         return (label, result)
+    except TimeoutError:
+        logger.warning("Source '%s' timed out", label)
+        return (label, None)
     except Exception as e:
         logger.error("Source '%s' failed: %s", label, e)
         return (label, None)
@@ -480,73 +495,121 @@ _FRIENDLY_LABELS = {
 }
 
 
+# Dynamic labels: "<kind>:<detail>" where detail is a company, school or term index
+_FRIENDLY_PREFIXES = {
+    ("google", "company"): lambda rest: f"Google: {rest}",
+    ("google", "edu"): lambda rest: f"Google: {rest}",
+    ("google", "term"): lambda rest: f"Google: key term #{int(rest) + 1}",
+    ("news", "company"): lambda rest: f"News: {rest}",
+}
+
+
 def _friendly(label: str) -> str:
-    if label in _FRIENDLY_LABELS:
-        return _FRIENDLY_LABELS[label]
-    if label.startswith("google:company:"):
-        return f"Google: {label.split(':',2)[2]}"
-    if label.startswith("google:edu:"):
-        return f"Google: {label.split(':',2)[2]}"
-    if label.startswith("google:term:"):
-        return f"Google: key term #{int(label.split(':')[2])+1}"
-    if label.startswith("news:company:"):
-        return f"News: {label.split(':',2)[2]}"
-    return label
+    friendly = _FRIENDLY_LABELS.get(label)
+    if friendly:
+        return friendly
+    source, _, tail = label.partition(":")
+    kind, _, rest = tail.partition(":")
+    fmt = _FRIENDLY_PREFIXES.get((source, kind))
+    return fmt(rest) if fmt else label
+
+
+# Start order for source tasks (lower first). In-flight slots are handed out FIFO, so
+# under load the sources the report depends on most get started before the long tail.
+_TASK_PRIORITY = {
+    "linkedin:chosen": 0,
+    "linkedin:playwright": 1,
+    "linkedin:serpapi": 1,
+    "github:direct": 1,
+    "google:main": 2,
+    "news:main": 2,
+    "github:name": 2,
+    "company_verify": 2,
+    "social_media": 3,
+    "references": 3,
+    "photo_search": 3,
+}
+_LOW_PRIORITY = 4  # resume-derived google:/news:/github: follow-up queries
 
 
-async def run_pipeline_streaming(
+def _build_tasks(
     request: BackgroundCheckRequest,
     linkedin_provider: LinkedInProvider,
-    resume_data: ResumeData | None = None,
-    photo_url: str | None = None,
-):
+    resume_data: ResumeData | None,
+    photo_url: str | None,
+) -> tuple[list[asyncio.Task], list[tuple[str, str]], list[str]]:
     """
-    Streaming version of run_pipeline.
-    Yields dicts: {"type": "status"|"result", "data": {...}}
+    Start a labeled task for every source, highest priority first.
+    Returns (tasks, [(linkedin label, provider name)], search labels).
     """
     search_tasks = _build_search_queries(request, resume_data)
 
-    # --- Build all task coroutines with labels ---
-    all_tasks = []
+    pending = []
+
+    def add(label: str, coro, limited: bool = True, timed: bool = True):
+        pending.append((label, _labeled_task(coro, label, limited=limited, timed=timed)))
 
     # LinkedIn providers
+    # The chosen provider runs first; Playwright/SerpAPI only run if its profile is thin.
     linkedin_labels = []
-    all_tasks.append(_labeled_task(linkedin_provider.fetch_profile(request), "linkedin:chosen"))
+    chosen_key = linkedin_provider.PROVIDER_KEY
+    # The fallbacks wait on this future; the fetch itself only starts once it holds a slot
+    primary = asyncio.get_running_loop().create_future()
+    add("linkedin:chosen", lambda: _publish(primary, _fetch_linkedin(linkedin_provider, request)),
+        limited=chosen_key != "playwright")
     linkedin_labels.append(("linkedin:chosen", type(linkedin_provider).__name__))
 
-    linkedin_url = request.linkedin_url or (resume_data.linkedin_url if resume_data else None)
-    from app.providers.playwright_scraper import PlaywrightProvider
-    from app.providers.serpapi import SerpAPIProvider
+    # The route already folds the resume URL into the request, so usually no copy is needed
+    li_req = request
+    if not request.linkedin_url and resume_data and resume_data.linkedin_url:
+        li_req = request.model_copy(update={"linkedin_url": resume_data.linkedin_url})
 
-    li_req = request.model_copy(update={"linkedin_url": linkedin_url}) if linkedin_url else request
-
-    if not isinstance(linkedin_provider, PlaywrightProvider):
-        all_tasks.append(_labeled_task(PlaywrightProvider().fetch_profile(li_req), "linkedin:playwright"))
+    if chosen_key != "playwright":
+        add("linkedin:playwright", _linkedin_fallback(
+            primary, lambda: _fetch_linkedin(get_provider("playwright"), li_req), limited=False,
+        ), limited=False, timed=False)
         linkedin_labels.append(("linkedin:playwright", "PlaywrightProvider"))
-    if not isinstance(linkedin_provider, SerpAPIProvider):
-        all_tasks.append(_labeled_task(SerpAPIProvider().fetch_profile(li_req), "linkedin:serpapi"))
+    if chosen_key != "serpapi":
+        add("linkedin:serpapi", _linkedin_fallback(
+            primary, lambda: _fetch_linkedin(get_provider("serpapi"), li_req), limited=True,
+        ), limited=False, timed=False)
         linkedin_labels.append(("linkedin:serpapi", "SerpAPIProvider"))
 
     # Search tasks
     search_labels = []
     for name, (task_type, query) in search_tasks.items():
-        all_tasks.append(_labeled_task(_run_task(task_type, query), name))
+        add(name, _run_task(task_type, query))
         search_labels.append(name)
 
     # Extra tasks
     if resume_data:
-        all_tasks.append(_labeled_task(verify_companies(resume_data), "company_verify"))
-    all_tasks.append(_labeled_task(scan_social_media(request), "social_media"))
-    all_tasks.append(_labeled_task(discover_references(request, resume_data), "references"))
+        add("company_verify", verify_companies(resume_data))
+    add("social_media", scan_social_media(request))
+    add("references", discover_references(request, resume_data))
     if photo_url:
-        all_tasks.append(_labeled_task(reverse_photo_search(photo_url), "photo_search"))
+        add("photo_search", reverse_photo_search(photo_url))
+
+    # as_completed() schedules from a set, so the order has to be fixed here
+    pending.sort(key=lambda entry: _TASK_PRIORITY.get(entry[0], _LOW_PRIORITY))
+    tasks = [asyncio.create_task(coro) for _, coro in pending]
+    return tasks, linkedin_labels, search_labels
 
+
+async def run_pipeline_streaming(
+    request: BackgroundCheckRequest,
+    linkedin_provider: LinkedInProvider,
+    resume_data: ResumeData | None = None,
+    photo_url: str | None = None,
+):
+    """
+    Streaming version of run_pipeline.
+    Yields dicts: {"type": "status", "data": {...}} and finally {"type": "result", "data": BackgroundReport}
+    """
+    all_tasks, linkedin_labels, search_labels = _build_tasks(request, linkedin_provider, resume_data, photo_url)
     total = len(all_tasks)
 
     # Emit initial status for all tasks
-    all_labels = []
-    for t_label, _ in linkedin_labels:
-        all_labels.append(t_label)
+    all_labels = [t_label for t_label, _ in linkedin_labels]
     all_labels.extend(search_labels)
     if resume_data:
         all_labels.append("company_verify")
@@ -572,7 +635,9 @@ async def run_pipeline_streaming(
 
         state = "done" if result is not None else "error"
         detail = ""
-        if result is not None:
+        if result is _SKIPPED:
+            state, detail = "skipped", "Primary profile was complete"
+        elif result is not None:
             if label.startswith("linkedin:") and result:
                 detail = result.name or "Profile found"
             elif isinstance(result, tuple):
@@ -593,19 +658,35 @@ async def run_pipeline_streaming(
         "completed": total, "total": total,
     }}
 
+    report = await _assemble_report(
+        request, linkedin_provider, resume_data, results_map, linkedin_labels, search_labels,
+    )
+    yield {"type": "result", "data": report}
+
+
+async def _assemble_report(
+    request: BackgroundCheckRequest,
+    linkedin_provider: LinkedInProvider,
+    resume_data: ResumeData | None,
+    results_map: dict,
+    linkedin_labels: list[tuple[str, str]],
+    search_labels: list[str],
+) -> BackgroundReport:
+    """Merge the per-source results, build the LLM context and turn the LLM output into a report."""
     # Collect LinkedIn results
     li_results = []
     li_providers_used = []
     for t_label, provider_name in linkedin_labels:
         r = results_map.get(t_label)
+        if r is None or r is _SKIPPED:
+            continue
         li_results.append(r)
-        if r is not None:
-            li_providers_used.append(provider_name)
+        li_providers_used.append(provider_name)
     linkedin_profile = _pick_best_linkedin(li_results)
 
     # Collect search results
     all_google, all_news, all_github = [], [], []
-    seen_urls, seen_gh = set(), set()
+    seen_google, seen_news, seen_gh = set(), set(), set()
     for label in search_labels:
         result = results_map.get(label)
         if result is None:
@@ -613,19 +694,22 @@ async def run_pipeline_streaming(
         result_type, items = result if isinstance(result, tuple) else ("unknown", [])
         if result_type == "google":
             for item in items:
-                if item.url not in seen_urls:
-                    seen_urls.add(item.url)
+                key = _normalize_url(item.url)
+                if key not in seen_google:
+                    seen_google.add(key)
                     item.source = f"google ({label.split(':', 1)[-1]})"
-                    all_google.append(item)
+                    all_google.append(item.to_model())
         elif result_type == "news":
             for item in items:
-                if item.url not in seen_urls:
-                    seen_urls.add(item.url)
-                    all_news.append(item)
+                key = _normalize_url(item.url)
+                if key not in seen_news:
+                    seen_news.add(key)
+                    all_news.append(item.to_model())
         elif result_type == "github":
             for profile in items:
-                if profile.username not in seen_gh:
-                    seen_gh.add(profile.username)
+                key = profile.username.lower()
+                if key not in seen_gh:
+                    seen_gh.add(key)
                     all_github.append(profile)
 
     company_checks = results_map.get("company_verify") or []
@@ -649,98 +733,80 @@ async def run_pipeline_streaming(
             if sp.url not in {p.url for p in social_profiles}:
                 social_profiles.append(sp)
 
-    # Build context
-    sources_used, raw_parts = [], []
+    sources_used = []
     if resume_data:
         sources_used.append("Resume (uploaded)")
-        raw_parts.append(_resume_to_text(resume_data))
     if linkedin_profile:
         sources_used.append(f"LinkedIn ({' + '.join(li_providers_used)})")
-        raw_parts.append(_linkedin_to_text(linkedin_profile))
     if all_github:
         sources_used.append(f"GitHub ({len(all_github)} profiles)")
-        for i, gh in enumerate(all_github):
-            raw_parts.append(_github_to_text(gh, i + 1))
     if all_google:
         sources_used.append(f"Google ({len(all_google)} results)")
-        for r in all_google:
-            raw_parts.append(f"[{r.source}] {r.title}: {r.snippet}")
     if all_news:
         sources_used.append(f"News ({len(all_news)} articles)")
-        for r in all_news:
-            raw_parts.append(f"[news] {r.title}: {r.snippet}")
     if company_checks:
         sources_used.append(f"Company Verify ({len(company_checks)})")
-        for cc in company_checks:
-            raw_parts.append(f"[company] {cc.name}: {'VERIFIED' if cc.verified else 'NOT VERIFIED'} — {cc.description}")
     if social_profiles:
         sources_used.append(f"Social Media ({len(social_profiles)})")
-        for sp in social_profiles:
-            raw_parts.append(f"[social: {sp.platform}] {sp.url} — {sp.snippet}")
     if photo_matches:
         sources_used.append(f"Reverse Photo ({len(photo_matches)} matches)")
-        for pm in photo_matches:
-            platform_tag = f" [{pm.platform}]" if pm.platform else ""
-            raw_parts.append(f"[photo match{platform_tag}] {pm.url} — {pm.title}")
     if reference_contacts:
         sources_used.append(f"References ({len(reference_contacts)} contacts found)")
-        for rc in reference_contacts:
-            raw_parts.append(
-                f"[reference: {rc.category}] {rc.name} — {rc.title} at {rc.company} ({rc.linkedin_url})"
-            )
 
     aggregated = AggregatedData(
         linkedin=linkedin_profile, github_profiles=all_github, resume=resume_data,
         company_checks=company_checks, social_profiles=social_profiles,
         photo_matches=photo_matches, reference_contacts=reference_contacts,
         search_results=all_google, news_articles=all_news,
-        raw_context="\n\n".join(raw_parts),
     )
+    if settings.llm_context_format == "json":
+        aggregated.context_parts = _json_context(aggregated)
+    else:
+        aggregated.context_parts = _text_context(aggregated)
 
     llm_result = await generate_report(request, aggregated)
 
-    identity_raw = llm_result.get("identity_verification")
-    identity = None
-    if identity_raw and isinstance(identity_raw, dict):
-        identity = IdentityVerification(**{k: identity_raw.get(k, d) for k, d in [
-            ("confidence", ""), ("reasoning", ""), ("multiple_people_detected", False),
-            ("profiles_found", []), ("cross_reference_notes", []),
-        ]})
-
-    verdict_raw = llm_result.get("verdict")
-    verdict = None
-    if verdict_raw and isinstance(verdict_raw, dict):
-        verdict = BackgroundVerdict(**{k: verdict_raw.get(k, d) for k, d in [
-            ("rating", ""), ("score", 0), ("summary", ""),
-            ("resume_vs_online", []), ("red_flags", []), ("green_flags", []), ("recommendations", []),
-        ]})
-
     providers_str = " + ".join(li_providers_used) if li_providers_used else type(linkedin_provider).__name__
+    return _build_report(request, aggregated, llm_result, providers_str, sources_used)
+
+
+def _build_report(
+    request: BackgroundCheckRequest,
+    aggregated: AggregatedData,
+    llm_result: dict,
+    providers_used: str,
+    sources_used: list[str],
+) -> BackgroundReport:
+    """Turn the LLM output into the final report. A malformed LLM section is dropped, not fatal."""
+    linkedin_profile = aggregated.linkedin
     confidence = ""
     if not linkedin_profile:
         confidence = "No LinkedIn profile found."
     elif linkedin_profile.raw_text and not linkedin_profile.experience:
         confidence = "LinkedIn data was partially extracted."
 
-    report = BackgroundReport(
+    highlights = llm_result.get("key_highlights")
+    return BackgroundReport(
         name=request.name, generated_at=datetime.now(timezone.utc),
-        linkedin_profile=linkedin_profile, github_profiles=all_github,
-        resume_data=resume_data, company_checks=company_checks,
-        social_profiles=social_profiles, photo_matches=photo_matches,
-        reference_contacts=reference_contacts, identity_verification=identity,
-        verdict=verdict, summary=llm_result.get("summary", ""),
-        professional_background=llm_result.get("professional_background", ""),
-        key_highlights=llm_result.get("key_highlights", []),
-        news_mentions=all_news, sources_used=sources_used,
-        provider_used=providers_str, confidence_note=confidence,
+        linkedin_profile=linkedin_profile, github_profiles=aggregated.github_profiles,
+        resume_data=aggregated.resume, company_checks=aggregated.company_checks,
+        social_profiles=aggregated.social_profiles, photo_matches=aggregated.photo_matches,
+        reference_contacts=aggregated.reference_contacts,
+        identity_verification=_llm_section(IdentityVerification, llm_result.get("identity_verification")),
+        verdict=_llm_section(BackgroundVerdict, llm_result.get("verdict")),
+        summary=str(llm_result.get("summary") or ""),
+        professional_background=str(llm_result.get("professional_background") or ""),
+        key_highlights=[str(h) for h in highlights] if isinstance(highlights, list) else [],
+        news_mentions=aggregated.news_articles, sources_used=sources_used,
+        provider_used=providers_used, confidence_note=confidence,
     )
 
-    yield {"type": "result", "data": report.model_dump()}
 
-
-async def _safe_fetch(coro, label: str):
+def _llm_section(model: type[BaseModel], raw):
+    if not raw or not isinstance(raw, dict):
+        return None
     try:
-        return await coro
-    except Exception as e:
-        logger.error("Source '%s' failed: %s", label, e)
+        return model.model_validate(raw)
+    except ValidationError as e:
+        logger.warning("Dropping malformed LLM %s (%d validation errors)", model.__name__, e.error_count())
         return None
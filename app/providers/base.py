@@ -1,8 +1,35 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, ClassVar
+
+import httpx
+
 from app.models import LinkedInProfile, BackgroundCheckRequest
+from app.config import settings
+from app.utils.serpapi import serpapi_search
+
+
+def field_extractor(fields: dict[str, tuple[str, ...]]) -> Callable[[dict], dict[str, Any]]:
+    """Build `extract(data)` returning, per output field, the first truthy value among its keys."""
+    table = tuple(fields.items())
+
+    def extract(d: dict) -> dict[str, Any]:
+        out = {}
+        for field, keys in table:
+            value = None
+            for key in keys:
+                value = d.get(key)
+                if value:
+                    break
+            out[field] = value
+        return out
+
+    return extract
 
 
 class LinkedInProvider(ABC):
+    PROVIDER_KEY: ClassVar[str]  # matches the LINKEDIN_PROVIDER / registry name
 
     @abstractmethod
     async def fetch_profile(self, request: BackgroundCheckRequest) -> LinkedInProfile | None: ...
@@ -17,3 +44,46 @@ class LinkedInProvider(ABC):
             parts.append(request.location)
         parts.append("LinkedIn")
         return " ".join(parts)
+
+    async def _find_linkedin_result(self, request: BackgroundCheckRequest) -> dict | None:
+        """Google (via SerpAPI) for the person's linkedin.com/in/ page.
+
+        Every query is sent at once; the first match, most specific query first,
+        wins. Searches are cached and shared by serpapi_search.
+        """
+        if not settings.serpapi_api_key:
+            return None
+
+        queries = [self._build_search_query(request)]
+        if request.company:
+            queries.append(f"{request.name} {request.company}")
+        queries.append(f'"{request.name}"')
+
+        first_name = request.name.split()[0].lower()
+        tasks = [
+            asyncio.create_task(serpapi_search({
+                "engine": "google",
+                "q": f"site:linkedin.com/in/ {query}",
+                "num": 5,
+                # Only the fields we read; SerpAPI trims the rest server-side
+                "json_restrictor": "organic_results[].{link,title,snippet}",
+            }))
+            for query in queries
+        ]
+        try:
+            for task in tasks:
+                try:
+                    data = await task
+                except httpx.HTTPError:
+                    continue
+                if data is None:
+                    continue
+                for result in data.get("organic_results", []):
+                    if "linkedin.com/in/" in result.get("link", "") and first_name in result.get("title", "").lower():
+                        return result
+            return None
+        finally:
+            # Only stops waiting: serpapi_search finishes (and caches) searches already sent.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
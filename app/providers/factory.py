@@ -1,22 +1,28 @@
+import importlib
+
 from app.providers.base import LinkedInProvider
-from app.providers.serpapi import SerpAPIProvider
-from app.providers.playwright_scraper import PlaywrightProvider
-from app.providers.proxycurl import ProxycurlProvider
-from app.providers.rapidapi import RapidAPIProvider
 
-_REGISTRY: dict[str, type[LinkedInProvider]] = {
-    "serpapi": SerpAPIProvider,
-    "playwright": PlaywrightProvider,
-    "proxycurl": ProxycurlProvider,
-    "rapidapi": RapidAPIProvider,
+# "module:Class" per provider key; modules are only imported when first used, so
+# a deployment that never scrapes doesn't pay for importing Playwright.
+_REGISTRY: dict[str, str] = {
+    "serpapi": "app.providers.serpapi:SerpAPIProvider",
+    "playwright": "app.providers.playwright_scraper:PlaywrightProvider",
+    "proxycurl": "app.providers.proxycurl:ProxycurlProvider",
+    "rapidapi": "app.providers.rapidapi:RapidAPIProvider",
 }
+_instances: dict[str, LinkedInProvider] = {}
 
 
 def get_provider(name: str) -> LinkedInProvider:
-    cls = _REGISTRY.get(name)
-    if cls is None:
-        raise ValueError(
-            f"Unknown LinkedIn provider '{name}'. "
-            f"Choose from: {', '.join(_REGISTRY)}"
-        )
-    return cls()
+    """Shared (stateless) provider instance for `name`."""
+    provider = _instances.get(name)
+    if provider is None:
+        spec = _REGISTRY.get(name)
+        if spec is None:
+            raise ValueError(
+                f"Unknown LinkedIn provider '{name}'. "
+                f"Choose from: {', '.join(_REGISTRY)}"
+            )
+        module_path, cls_name = spec.split(":")
+        provider = _instances[name] = getattr(importlib.import_module(module_path), cls_name)()
+    return provider
@@ -1,43 +1,208 @@
+import asyncio
 import logging
+import re
+from pathlib import Path
 from typing import Optional
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from playwright.async_api import async_playwright, Browser, Page, BrowserContext, Error as PlaywrightError
 
 from app.providers.base import LinkedInProvider
 from app.models import LinkedInProfile, BackgroundCheckRequest
 from app.config import settings
-from app.utils.http import get_client
 
 logger = logging.getLogger(__name__)
 
+_playwright = None
 _browser: Browser | None = None
-_context: BrowserContext | None = None
+_contexts: list[BrowserContext] = []
+# Idle contexts; a scrape checks one out, so the pool size caps concurrent scrapes.
+_pool: asyncio.Queue[BrowserContext] | None = None
+_launch_lock = asyncio.Lock()
+_warm_task: asyncio.Task | None = None
+
+# Selector fallbacks, most specific first (LinkedIn markup changes often).
+_NAME_SELECTORS = ("h1.text-heading-xlarge", "h1.top-card-layout__title", "h1")
+_HEADLINE_SELECTORS = ("div.text-body-medium.break-words", ".top-card-layout__headline", "div.text-body-medium")
+_LOCATION_SELECTORS = ("span.text-body-small.inline.t-black--light.break-words", ".top-card-layout__first-subline")
+_ABOUT_SELECTORS = ("section.pv-about-section div.inline-show-more-text", "#about ~ div span[aria-hidden='true']")
+_SKILL_SELECTORS = (
+    "#skills ~ div .pvs-list__paged-list-item span[aria-hidden='true']",
+    "section:has(#skills) span.mr1 span[aria-hidden='true']",
+)
+_SECTION_ITEM_SELECTORS = ("li.artdeco-list__item", "li.pvs-list__paged-list-item", "li")
+# Duration lines, e.g. "Jan 2020 - Present", "2 yrs 3 mos", "2018–2020"
+_DUR_RE = re.compile(r"(?i)present|\byrs?\b|\bmos?\b|\s-\s|–")
+
+# Scroll in the browser until lazy sections stop growing the page, then go back up.
+_SCROLL_JS = """async () => {
+    let prev = -1;
+    for (let i = 0; i < 6; i++) {
+        window.scrollBy(0, 800);
+        await new Promise(r => setTimeout(r, 150));
+        if (document.body.scrollHeight === prev) break;
+        prev = document.body.scrollHeight;
+    }
+    window.scrollTo(0, 0);
+}"""
+
+# One round trip for every field: takes the selector tuples above, returns plain JSON.
+_EXTRACT_JS = """(sel) => {
+    const text = (el) => (el && el.innerText || "").trim();
+    const first = (root, sels) => {
+        for (const s of sels) {
+            const t = text(root.querySelector(s));
+            if (t) return t;
+        }
+        return null;
+    };
+    const all = (root, sels) => {
+        for (const s of sels) {
+            const els = root.querySelectorAll(s);
+            if (els.length) return Array.from(els);
+        }
+        return [];
+    };
+    const section = (id) => {
+        let sec = null;
+        try {
+            sec = document.querySelector(`section:has(${id})`);
+        } catch (e) {}  // :has() unsupported
+        sec = sec || (document.querySelector(id) || {closest: () => null}).closest("section");
+        return sec ? all(sec, sel.items).slice(0, 10).map(text) : [];
+    };
+    return {
+        name: first(document, sel.name),
+        headline: first(document, sel.headline),
+        location: first(document, sel.location),
+        summary: first(document, sel.about),
+        skills: all(document, sel.skills).slice(0, 20).map(text),
+        experience: section("#experience"),
+        education: section("#education"),
+        raw_text: text(document.querySelector("main") || document.body).slice(0, 6000),
+    };
+}"""
+_EXTRACT_ARGS = {
+    "name": _NAME_SELECTORS,
+    "headline": _HEADLINE_SELECTORS,
+    "location": _LOCATION_SELECTORS,
+    "about": _ABOUT_SELECTORS,
+    "skills": _SKILL_SELECTORS,
+    "items": _SECTION_ITEM_SELECTORS,
+}
 
 
 async def _get_browser() -> Browser:
-    global _browser
+    global _playwright, _browser
     if _browser is None:
-        pw = await async_playwright().start()
-        _browser = await pw.chromium.launch(headless=settings.playwright_headless)
+        _playwright = await async_playwright().start()
+        _browser = await _playwright.chromium.launch(headless=settings.playwright_headless)
     return _browser
 
 
-async def _get_context() -> BrowserContext:
-    global _context
-    if _context is None:
-        browser = await _get_browser()
-        _context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 800},
-        )
-        if settings.linkedin_email and settings.linkedin_password:
-            await _do_login(_context)
-    return _context
+async def _get_pool() -> asyncio.Queue[BrowserContext]:
+    global _pool
+    if _pool is not None:
+        return _pool
+    # Concurrent first scrapes would otherwise each launch a browser and log in.
+    async with _launch_lock:
+        if _pool is None:
+            contexts = await _build_contexts(await _get_browser())
+            pool: asyncio.Queue[BrowserContext] = asyncio.Queue()
+            for context in contexts:
+                pool.put_nowait(context)
+            # Published together, so slot N in _contexts is always the context built for slot N
+            _contexts[:] = contexts
+            _pool = pool
+    return _pool
+
+
+async def _build_contexts(browser: Browser) -> list[BrowserContext]:
+    """One context per pool slot; if any fails, the ones already built are closed."""
+    proxies = [p.strip() for p in settings.playwright_proxies.split(",") if p.strip()]
+    contexts: list[BrowserContext] = []
+    # Cookies of the first logged-in context; slots without saved state start from
+    # them, so the account logs in at most once instead of once per context.
+    session: dict | None = None
+    login_tried = False
+    try:
+        for slot in range(max(1, settings.playwright_pool_size)):
+            proxy = proxies[slot % len(proxies)] if proxies else None
+            restored = _has_saved_state(slot)
+            context = await _new_context(browser, slot, proxy, session)
+            contexts.append(context)
+            if session is None and restored:
+                session = await context.storage_state()
+            elif session is None and _has_credentials() and not login_tried:
+                login_tried = True
+                if await _do_login(context):
+                    session = await context.storage_state()
+    except BaseException:
+        for context in contexts:
+            try:
+                await context.close()
+            except PlaywrightError as e:
+                logger.debug("Closing a half-built browser context failed: %s", e)
+        raise
+    return contexts
+
+
+def _warm_pool() -> None:
+    """Start building the pool in the background, unless it exists or is already being built."""
+    global _warm_task
+    if _pool is None and (_warm_task is None or _warm_task.done()):
+        _warm_task = asyncio.create_task(_get_pool())
+        _warm_task.add_done_callback(_log_warm_failure)
+
+
+def _log_warm_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception():
+        logger.warning("Playwright pool warm-up failed: %s", task.exception())
+
+
+def _state_path(slot: int) -> Path | None:
+    if not settings.playwright_state_dir:
+        return None
+    return Path(settings.playwright_state_dir) / f"slot{slot}.json"
+
 
+def _has_saved_state(slot: int) -> bool:
+    state = _state_path(slot)
+    return bool(state and state.exists())
 
-async def _do_login(context: BrowserContext):
+
+def _has_credentials() -> bool:
+    return bool(settings.linkedin_email and settings.linkedin_password)
+
+
+async def _new_context(browser: Browser, slot: int, proxy: str | None, session: dict | None) -> BrowserContext:
+    """Context with its own cookies: the slot's saved state if there is one, else `session`."""
+    options = {}
+    if proxy:
+        options["proxy"] = {"server": proxy}
+    if _has_saved_state(slot):
+        options["storage_state"] = str(_state_path(slot))
+    elif session is not None:
+        options["storage_state"] = session
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ),
+        viewport={"width": 1280, "height": 800},
+        **options,
+    )
+    return context
+
+
+async def prewarm_browser():
+    """Launch the browser (and log in) ahead of the first scrape."""
+    try:
+        await _get_pool()
+        logger.info("Playwright browser ready")
+    except Exception as e:
+        logger.warning("Playwright prewarm failed: %s", e)
+
+
+async def _do_login(context: BrowserContext) -> bool:
     page = await context.new_page()
     try:
         await page.goto("https://www.linkedin.com/login", wait_until="networkidle")
@@ -46,72 +211,72 @@ async def _do_login(context: BrowserContext):
         await page.click("button[type='submit']")
         await page.wait_for_url("**/feed/**", timeout=15000)
         logger.info("LinkedIn login successful")
+        return True
     except Exception as e:
         logger.warning("LinkedIn login failed: %s", e)
+        return False
     finally:
         await page.close()
 
 
 async def close_browser():
-    global _browser, _context
-    if _context:
-        await _context.close()
-        _context = None
+    global _playwright, _browser, _pool
+    if _warm_task:
+        _warm_task.cancel()
+    _pool = None
+    for slot, context in enumerate(_contexts):
+        state = _state_path(slot)
+        if state:
+            try:
+                state.parent.mkdir(parents=True, exist_ok=True)
+                await context.storage_state(path=str(state))
+            except Exception as e:
+                logger.warning("Could not save Playwright state for slot %d: %s", slot, e)
+        await context.close()
+    _contexts.clear()
     if _browser:
         await _browser.close()
         _browser = None
+    if _playwright:
+        await _playwright.stop()
+        _playwright = None
 
 
 class PlaywrightProvider(LinkedInProvider):
+    PROVIDER_KEY = "playwright"
 
     async def fetch_profile(self, request: BackgroundCheckRequest) -> LinkedInProfile | None:
         url = request.linkedin_url
         if not url:
+            # Get the browser up (if it isn't already) while Google looks for the profile;
+            # a miss returns without waiting for it.
+            _warm_pool()
             url = await self._find_profile_url(request)
         if not url:
             return None
         return await self._scrape_profile(url)
 
     async def _find_profile_url(self, request: BackgroundCheckRequest) -> Optional[str]:
-        if not settings.serpapi_api_key:
-            return None
-
-        client = get_client()
-        first_name = request.name.split()[0].lower()
-
-        queries = [self._build_search_query(request)]
-        if request.company:
-            queries.append(f"{request.name} {request.company}")
-        queries.append(f'"{request.name}"')
-
-        for query in queries:
-            params = {
-                "engine": "google",
-                "q": f"site:linkedin.com/in/ {query}",
-                "num": 3,
-                "api_key": settings.serpapi_api_key,
-            }
-            resp = await client.get("https://serpapi.com/search.json", params=params)
-            if resp.status_code != 200:
-                continue
-            data = resp.json()
-            for result in data.get("organic_results", []):
-                link = result.get("link", "")
-                title = result.get("title", "")
-                if "linkedin.com/in/" in link and first_name in title.lower():
-                    return link
-        return None
+        result = await self._find_linkedin_result(request)
+        return result.get("link") if result else None
 
     async def _scrape_profile(self, url: str) -> LinkedInProfile | None:
         # Strip tracking params that cause redirects
         clean_url = url.split("?")[0]
 
-        context = await _get_context()
+        pool = await _get_pool()
+        context = await pool.get()
+        try:
+            return await self._scrape_page(context, clean_url)
+        finally:
+            pool.put_nowait(context)
+
+    async def _scrape_page(self, context: BrowserContext, clean_url: str) -> LinkedInProfile | None:
         page = await context.new_page()
         try:
             await page.goto(clean_url, wait_until="domcontentloaded", timeout=25000)
             # Wait for page to render (don't use networkidle — LinkedIn never stops polling)
-            await page.wait_for_timeout(3000)
+            await self._wait_rendered(page)
 
             # Check if we got redirected to login page
             current_url = page.url
@@ -121,18 +286,11 @@ class PlaywrightProvider(LinkedInProvider):
                 public_url = clean_url.replace("www.linkedin.com", "linkedin.com")
                 if "linkedin.com/in/" in public_url:
                     await page.goto(public_url, wait_until="domcontentloaded", timeout=20000)
-                    await page.wait_for_timeout(2000)
+                    await self._wait_rendered(page)
 
             # Scroll down to load lazy sections
-            for _ in range(5):
-                try:
-                    await page.evaluate("window.scrollBy(0, 800)")
-                    await page.wait_for_timeout(400)
-                except Exception:
-                    break
             try:
-                await page.evaluate("window.scrollTo(0, 0)")
-                await page.wait_for_timeout(500)
+                await page.evaluate(_SCROLL_JS)
             except Exception:
                 pass
 
@@ -143,125 +301,46 @@ class PlaywrightProvider(LinkedInProvider):
         finally:
             await page.close()
 
-    async def _extract_profile(self, page: Page, url: str) -> LinkedInProfile:
-        """Extract profile using multiple selector strategies + full text fallback."""
-
-        # Strategy 1: Try known selectors (may break as LinkedIn updates)
-        name = (
-            await self._safe_text(page, "h1.text-heading-xlarge") or
-            await self._safe_text(page, "h1.top-card-layout__title") or
-            await self._safe_text(page, "h1")
-        )
-        headline = (
-            await self._safe_text(page, "div.text-body-medium.break-words") or
-            await self._safe_text(page, ".top-card-layout__headline") or
-            await self._safe_text(page, "div.text-body-medium")
-        )
-        location = (
-            await self._safe_text(page, "span.text-body-small.inline.t-black--light.break-words") or
-            await self._safe_text(page, ".top-card-layout__first-subline")
-        )
-        about = await self._safe_text(page, "section.pv-about-section div.inline-show-more-text") or \
-                await self._safe_text(page, "#about ~ div span[aria-hidden='true']")
-
-        # Strategy 2: Extract experience section
-        experience = await self._extract_section_items(page, "#experience")
-        education = await self._extract_section_items(page, "#education")
-
-        # Strategy 3: Extract skills
-        skills = []
-        skill_elements = await page.query_selector_all(
-            "#skills ~ div .pvs-list__paged-list-item span[aria-hidden='true']"
-        )
-        if not skill_elements:
-            skill_elements = await page.query_selector_all(
-                "section:has(#skills) span.mr1 span[aria-hidden='true']"
-            )
-        for el in skill_elements[:20]:
-            txt = (await el.inner_text()).strip()
-            if txt and len(txt) < 50:
-                skills.append(txt)
-
-        # Strategy 4: Always capture full page text as fallback for LLM
+    async def _wait_rendered(self, page: Page):
         try:
-            main_el = await page.query_selector("main") or await page.query_selector("body")
-            full_text = await main_el.inner_text() if main_el else ""
+            await page.wait_for_selector("h1, main", timeout=8000)
         except Exception:
-            full_text = ""
+            pass  # extract whatever did render
 
+    async def _extract_profile(self, page: Page, url: str) -> LinkedInProfile:
+        """Extract profile using multiple selector strategies + full text fallback."""
+        data = await page.evaluate(_EXTRACT_JS, _EXTRACT_ARGS)
         return LinkedInProfile(
             url=url,
-            name=name,
-            headline=headline,
-            location=location,
-            summary=about,
-            experience=experience,
-            education=education,
-            skills=skills,
-            raw_text=full_text[:6000],
+            name=data["name"],
+            headline=data["headline"],
+            location=data["location"],
+            summary=data["summary"],
+            experience=_parse_section_items(data["experience"]),
+            education=_parse_section_items(data["education"]),
+            skills=[s for s in data["skills"] if s and len(s) < 50],
+            # Always capture full page text as fallback for LLM
+            raw_text=data["raw_text"],
         )
 
-    async def _extract_section_items(self, page: Page, section_id: str) -> list[dict]:
-        """Extract items from an experience/education section by its anchor ID."""
-        items = []
-        # LinkedIn uses #experience, #education as anchor IDs
-        # The actual list is in a sibling/parent container
-        section = await page.query_selector(f"section:has({section_id})")
-        if not section:
-            # Try alternative: the ID might be on a div inside a section
-            section = await page.query_selector(f"{section_id}")
-            if section:
-                # Walk up to the section parent
-                section = await section.evaluate_handle("el => el.closest('section')")
-                section = section.as_element()
-
-        if not section:
-            return items
-
-        list_items = await section.query_selector_all("li.artdeco-list__item")
-        if not list_items:
-            list_items = await section.query_selector_all("li.pvs-list__paged-list-item")
-        if not list_items:
-            list_items = await section.query_selector_all("li")
-
-        for li in list_items[:10]:
-            try:
-                text = await li.inner_text()
-                lines = [l.strip() for l in text.strip().split("\n") if l.strip()]
-                # Filter out very short lines (icons, dots) and duplicates
-                lines = [l for l in lines if len(l) > 2]
-                if not lines:
-                    continue
-
-                item = {
-                    "title": lines[0] if lines else "",
-                    "company": lines[1] if len(lines) > 1 else "",
-                    "duration": "",
-                    "description": "",
-                }
-                # Look for duration patterns (e.g., "Jan 2020 - Present", "2 yrs 3 mos")
-                for l in lines[1:]:
-                    if any(kw in l.lower() for kw in ["present", "mos", "yrs", "yr", "mo", " - ", "–"]):
-                        item["duration"] = l
-                        break
-                # Description: remaining long lines
-                for l in lines[2:]:
-                    if len(l) > 40 and l != item["duration"]:
-                        item["description"] = l[:300]
-                        break
-
-                items.append(item)
-            except Exception:
-                continue
-
-        return items
 
-    async def _safe_text(self, page: Page, selector: str) -> Optional[str]:
-        try:
-            el = await page.query_selector(selector)
-            if el:
-                text = (await el.inner_text()).strip()
-                return text if text else None
-        except Exception:
-            pass
-        return None
+def _parse_section_items(texts: list[str]) -> list[dict]:
+    """Turn the innerText of experience/education list items into item dicts."""
+    items = []
+    for text in texts:
+        # Filter out empty and very short lines (icons, dots)
+        lines = [l for l in map(str.strip, text.split("\n")) if len(l) > 2]
+        if not lines:
+            continue
+
+        # Duration patterns (e.g., "Jan 2020 - Present", "2 yrs 3 mos"), then the first long line
+        duration = next((l for l in lines[1:] if _DUR_RE.search(l)), "")
+        description = next((l[:300] for l in lines[2:] if len(l) > 40 and l != duration), "")
+        items.append({
+            "title": lines[0],
+            "company": lines[1] if len(lines) > 1 else "",
+            "duration": duration,
+            "description": description,
+        })
+
+    return items
@@ -1,5 +1,6 @@
 import logging
-from app.providers.base import LinkedInProvider
+import orjson
+from app.providers.base import LinkedInProvider, field_extractor
 from app.models import LinkedInProfile, BackgroundCheckRequest
 from app.config import settings
 from app.utils.http import get_client
@@ -8,9 +9,16 @@ logger = logging.getLogger(__name__)
 
 PROXYCURL_ENDPOINT = "https://nubela.co/proxycurl/api/v2/linkedin"
 PROXYCURL_SEARCH = "https://nubela.co/proxycurl/api/search/person"
+_extract_scalars = field_extractor({
+    "name": ("full_name",),
+    "headline": ("headline",),
+    "location": ("city", "country_full_name"),
+    "summary": ("summary",),
+})
 
 
 class ProxycurlProvider(LinkedInProvider):
+    PROVIDER_KEY = "proxycurl"
 
     async def fetch_profile(self, request: BackgroundCheckRequest) -> LinkedInProfile | None:
         url = request.linkedin_url
@@ -27,16 +35,13 @@ class ProxycurlProvider(LinkedInProvider):
             headers=headers,
         )
         if resp.status_code != 200:
-            logger.warning("Proxycurl returned %d: %s", resp.status_code, resp.text[:200])
+            logger.warning("Proxycurl returned %d: %s", resp.status_code, resp.content[:200].decode("utf-8", "replace"))
             return None
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return LinkedInProfile(
             url=url,
-            name=data.get("full_name"),
-            headline=data.get("headline"),
-            location=data.get("city") or data.get("country_full_name"),
-            summary=data.get("summary"),
+            **_extract_scalars(data),
             experience=[
                 {
                     "title": exp.get("title"),
@@ -72,7 +77,7 @@ class ProxycurlProvider(LinkedInProvider):
         resp = await client.get(PROXYCURL_SEARCH, params=params, headers=headers)
         if resp.status_code != 200:
             return None
-        data = resp.json()
+        data = orjson.loads(resp.content)
         results = data.get("results", [])
         if results:
             return results[0].get("linkedin_profile_url")
@@ -1,13 +1,21 @@
 import logging
-from app.providers.base import LinkedInProvider
+import orjson
+from app.providers.base import LinkedInProvider, field_extractor
 from app.models import LinkedInProfile, BackgroundCheckRequest
 from app.config import settings
 from app.utils.http import get_client
 
 logger = logging.getLogger(__name__)
+_extract_scalars = field_extractor({
+    "name": ("full_name", "fullName"),
+    "headline": ("headline",),
+    "location": ("location",),
+    "summary": ("summary", "about"),
+})
 
 
 class RapidAPIProvider(LinkedInProvider):
+    PROVIDER_KEY = "rapidapi"
 
     async def fetch_profile(self, request: BackgroundCheckRequest) -> LinkedInProfile | None:
         url = request.linkedin_url
@@ -31,13 +39,14 @@ class RapidAPIProvider(LinkedInProvider):
             logger.warning("RapidAPI returned %d", resp.status_code)
             return None
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
+        scalars = _extract_scalars(data)
+        if not scalars["location"]:
+            scalars["location"] = data.get("geo", {}).get("full", "")
+        skills = [s.get("name", "") if isinstance(s, dict) else s for s in data.get("skills") or []]
         return LinkedInProfile(
             url=url,
-            name=data.get("full_name") or data.get("fullName"),
-            headline=data.get("headline"),
-            location=data.get("location") or data.get("geo", {}).get("full", ""),
-            summary=data.get("summary") or data.get("about"),
+            **scalars,
             experience=[
                 {
                     "title": exp.get("title"),
@@ -45,7 +54,7 @@ class RapidAPIProvider(LinkedInProvider):
                     "duration": exp.get("duration") or exp.get("dateRange"),
                     "description": exp.get("description"),
                 }
-                for exp in data.get("position", data.get("experiences", []))
+                for exp in data.get("position") or data.get("experiences") or []
             ],
             education=[
                 {
@@ -53,10 +62,7 @@ class RapidAPIProvider(LinkedInProvider):
                     "degree": edu.get("degreeName") or edu.get("degree"),
                     "field": edu.get("fieldOfStudy"),
                 }
-                for edu in data.get("educations", data.get("education", []))
-            ],
-            skills=[
-                s.get("name", s) if isinstance(s, dict) else s
-                for s in data.get("skills", [])
+                for edu in data.get("educations") or data.get("education") or []
             ],
+            skills=skills,
         )
@@ -1,4 +1,4 @@
-import json
+import orjson
 from typing import Optional, AsyncGenerator
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
@@ -13,6 +13,11 @@ router = APIRouter()
 
 MAX_RESUME_SIZE = 10 * 1024 * 1024  # 10 MB
 MAX_PHOTO_SIZE = 5 * 1024 * 1024  # 5 MB
+_READ_CHUNK = 64 * 1024
+# Request fields taken from the parsed resume when the form leaves them blank
+_RESUME_FILLS = ("company", "title", "location", "linkedin_url")
+# Keep proxies (nginx/Caddy) and caches from holding back status events
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 @router.post("/check")
@@ -45,17 +50,13 @@ async def create_background_check(
     resume_file_bytes = None
     resume_filename = None
     if resume and resume.filename:
-        resume_file_bytes = await resume.read()
+        resume_file_bytes = await _read_capped(resume, MAX_RESUME_SIZE, "Resume file too large (max 10MB)")
         resume_filename = resume.filename
-        if len(resume_file_bytes) > MAX_RESUME_SIZE:
-            raise HTTPException(status_code=413, detail="Resume file too large (max 10MB)")
 
     # Read photo bytes
     photo_bytes = None
     if photo and photo.filename:
-        photo_bytes = await photo.read()
-        if len(photo_bytes) > MAX_PHOTO_SIZE:
-            raise HTTPException(status_code=413, detail="Photo too large (max 5MB)")
+        photo_bytes = await _read_capped(photo, MAX_PHOTO_SIZE, "Photo too large (max 5MB)")
 
     # Resolve photo URL (upload if file provided, or use pasted URL)
     resolved_photo_url = (photo_url or "").strip() or None
@@ -63,7 +64,7 @@ async def create_background_check(
     provider_name = req.provider.value if req.provider else settings.linkedin_provider
     linkedin_provider = get_provider(provider_name)
 
-    async def event_stream() -> AsyncGenerator[str, None]:
+    async def event_stream() -> AsyncGenerator[bytes, None]:
         nonlocal req, resume_data, resolved_photo_url
 
         # Resume parsing phase
@@ -72,14 +73,14 @@ async def create_background_check(
             raw_text = await parse_resume_file(resume_file_bytes, resume_filename)
             if raw_text.strip():
                 resume_data = await extract_resume_data(raw_text)
-                if resume_data.company and not req.company:
-                    req = req.model_copy(update={"company": resume_data.company})
-                if resume_data.title and not req.title:
-                    req = req.model_copy(update={"title": resume_data.title})
-                if resume_data.location and not req.location:
-                    req = req.model_copy(update={"location": resume_data.location})
-                if resume_data.linkedin_url and not req.linkedin_url:
-                    req = req.model_copy(update={"linkedin_url": resume_data.linkedin_url})
+                # Fill in whatever the form left blank, in one copy
+                updates = {
+                    field: getattr(resume_data, field)
+                    for field in _RESUME_FILLS
+                    if getattr(resume_data, field) and not getattr(req, field)
+                }
+                if updates:
+                    req = req.model_copy(update=updates)
                 yield _sse("status", {"step": "resume_parse", "label": "Resume parsed", "state": "done",
                                       "detail": f"{len(resume_data.skills)} skills, {len(resume_data.experience)} roles extracted"})
             else:
@@ -103,11 +104,30 @@ async def create_background_check(
         ):
             yield _sse(event["type"], event["data"])
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
-def _sse(event_type: str, data: dict) -> str:
-    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+async def _read_capped(upload: UploadFile, cap: int, detail: str) -> bytes:
+    """Copy an upload into memory in chunks, rejecting it as soon as it passes `cap` bytes.
+
+    By now Starlette has already received the whole part and spooled it
+    (to disk past 1 MB), so this only bounds our in-memory copy. The request
+    body itself is limited by the reverse proxy (e.g. nginx client_max_body_size).
+    """
+    if upload.size is not None and upload.size > cap:
+        raise HTTPException(status_code=413, detail=detail)
+    buf = bytearray()
+    while chunk := await upload.read(_READ_CHUNK):
+        buf += chunk
+        if len(buf) > cap:
+            raise HTTPException(status_code=413, detail=detail)
+    return bytes(buf)
+
+
+def _sse(event_type: str, data: dict | BackgroundReport) -> bytes:
+    # Reports serialize straight to JSON in pydantic-core, without an intermediate dict
+    payload = data.model_dump_json().encode() if isinstance(data, BackgroundReport) else orjson.dumps(data, default=str)
+    return b"event: " + event_type.encode() + b"\ndata: " + payload + b"\n\n"
 
 
 @router.get("/health")
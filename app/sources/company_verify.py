@@ -2,11 +2,13 @@ import asyncio
 import logging
 from app.models import CompanyCheck, ResumeData
 from app.config import settings
-from app.utils.http import get_client
+from app.utils.cache import TTLCache
+from app.utils.serpapi import serpapi_search
 
 logger = logging.getLogger(__name__)
 
-SERPAPI_BASE = "https://serpapi.com/search.json"
+# Verdicts by lower-cased company name; the same big employers come up in most checks.
+_company_cache = TTLCache(maxsize=2048, ttl=settings.source_cache_ttl)
 
 
 async def verify_companies(resume: ResumeData) -> list[CompanyCheck]:
@@ -35,18 +37,23 @@ async def verify_companies(resume: ResumeData) -> list[CompanyCheck]:
 
 async def _check_company(company_name: str) -> CompanyCheck:
     """Search Google for a company to verify it exists."""
-    client = get_client()
-    params = {
-        "engine": "google",
-        "q": f'"{company_name}" company',
-        "num": 5,
-        "api_key": settings.serpapi_api_key,
-    }
-    resp = await client.get(SERPAPI_BASE, params=params)
-    if resp.status_code != 200:
-        return CompanyCheck(name=company_name, verified=False, description="Search failed")
-
-    data = resp.json()
+    key = company_name.strip().lower()
+    cached = _company_cache.get(key)
+    if cached is not None:
+        return cached if cached.name == company_name else cached.model_copy(update={"name": company_name})
+
+    # The verdict is what's cached, so the raw search isn't kept as well
+    data = await serpapi_search({"engine": "google", "q": f'"{company_name}" company', "num": 5}, cache=False)
+    if data is None:
+        return CompanyCheck(name=company_name, verified=False, description="Search failed")  # not cached
+
+    check = _evaluate_company(company_name, data)
+    _company_cache.set(key, check)
+    return check
+
+
+def _evaluate_company(company_name: str, data: dict) -> CompanyCheck:
+    """Decide from the search results whether the company is real."""
     organic = data.get("organic_results", [])
     knowledge = data.get("knowledge_graph", {})
 
@@ -1,5 +1,7 @@
+import asyncio
 import re
 import logging
+import orjson
 from app.models import GitHubProfile
 from app.utils.http import get_client
 
@@ -8,6 +10,7 @@ logger = logging.getLogger(__name__)
 GITHUB_SEARCH_API = "https://api.github.com/search/users"
 GITHUB_USER_API = "https://api.github.com/users"
 HEADERS = {"Accept": "application/vnd.github+json"}
+_USERNAME_RE = re.compile(r"github\.com/([a-zA-Z0-9_-]+)/?$")
 
 
 async def search_github_query(query: str) -> list[GitHubProfile]:
@@ -22,36 +25,35 @@ async def search_github_query(query: str) -> list[GitHubProfile]:
         logger.warning("GitHub search failed for '%s': %d", query, resp.status_code)
         return []
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     items = data.get("items", [])
     if not items:
         return []
 
-    profiles = []
-    for item in items[:5]:
-        profile = await fetch_github_user(item["login"])
-        if profile:
-            profiles.append(profile)
-    return profiles
+    results = await asyncio.gather(*(fetch_github_user(item["login"]) for item in items[:5]), return_exceptions=True)
+    return [p for p in results if isinstance(p, GitHubProfile)]
 
 
 async def fetch_github_user(username: str) -> GitHubProfile | None:
     """Fetch a single GitHub user by exact username."""
     client = get_client()
-    resp = await client.get(f"{GITHUB_USER_API}/{username}", headers=HEADERS)
+    # The repos call doesn't depend on the user call, so send both at once
+    resp, repos_resp = await asyncio.gather(
+        client.get(f"{GITHUB_USER_API}/{username}", headers=HEADERS),
+        client.get(
+            f"{GITHUB_USER_API}/{username}/repos",
+            params={"sort": "stars", "per_page": 5},
+            headers=HEADERS,
+        ),
+    )
     if resp.status_code != 200:
         return None
 
-    u = resp.json()
+    u = orjson.loads(resp.content)
 
     repos = []
-    repos_resp = await client.get(
-        f"{GITHUB_USER_API}/{username}/repos",
-        params={"sort": "stars", "per_page": 5},
-        headers=HEADERS,
-    )
     if repos_resp.status_code == 200:
-        for r in repos_resp.json()[:5]:
+        for r in orjson.loads(repos_resp.content)[:5]:
             repos.append({
                 "name": r.get("name", ""),
                 "description": r.get("description") or "",
@@ -77,5 +79,5 @@ async def fetch_github_user(username: str) -> GitHubProfile | None:
 
 def extract_github_username(url: str) -> str | None:
     """Extract username from a GitHub URL."""
-    match = re.search(r"github\.com/([a-zA-Z0-9_-]+)/?$", url.rstrip("/"))
+    match = _USERNAME_RE.search(url.rstrip("/"))
     return match.group(1) if match else None
@@ -1,13 +1,19 @@
-import base64
 import logging
+from urllib.parse import urlsplit
+import orjson
 from app.models import SocialProfile
 from app.config import settings
 from app.utils.http import get_client
+from app.utils.serpapi import serpapi_search
 
 logger = logging.getLogger(__name__)
 
-SERPAPI_BASE = "https://serpapi.com/search.json"
 IMGBB_UPLOAD = "https://api.imgbb.com/1/upload"
+_LENS_FIELDS = (
+    "visual_matches[].{link,title,source,thumbnail},"
+    "exact_matches[].{link,title,source,thumbnail},"
+    "knowledge_graph[].{title,link}"
+)
 
 # Map domains to platform names
 DOMAIN_PLATFORM_MAP = {
@@ -48,18 +54,18 @@ async def upload_to_imgbb(file_bytes: bytes) -> str | None:
         return None
 
     client = get_client()
-    b64 = base64.b64encode(file_bytes).decode("utf-8")
-
+    # Raw multipart upload: no base64 copy of the image (1.33x its size) to build and hold
     resp = await client.post(
         IMGBB_UPLOAD,
-        data={"key": settings.imgbb_api_key, "image": b64, "expiration": 600},
+        data={"key": settings.imgbb_api_key, "expiration": "600"},
+        files={"image": ("photo", file_bytes)},
         timeout=30,
     )
     if resp.status_code != 200:
-        logger.error("ImgBB upload failed: %d %s", resp.status_code, resp.text[:200])
+        logger.error("ImgBB upload failed: %d %s", resp.status_code, resp.content[:200].decode("utf-8", "replace"))
         return None
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     url = data.get("data", {}).get("url")
     logger.info("Photo uploaded to ImgBB: %s", url)
     return url
@@ -73,21 +79,15 @@ async def reverse_photo_search(image_url: str) -> dict:
     if not settings.serpapi_api_key:
         return {"visual_matches": [], "profiles": []}
 
-    client = get_client()
-
-    # Google Lens engine
-    params = {
+    # Google Lens engine; only the fields read below are sent back
+    data = await serpapi_search({
         "engine": "google_lens",
         "url": image_url,
-        "api_key": settings.serpapi_api_key,
-    }
-    resp = await client.get(SERPAPI_BASE, params=params, timeout=30)
-    if resp.status_code != 200:
-        logger.error("Google Lens search failed: %d %s", resp.status_code, resp.text[:300])
+        "json_restrictor": _LENS_FIELDS,
+    })
+    if data is None:
         return {"visual_matches": [], "profiles": []}
 
-    data = resp.json()
-
     visual_matches = []
     profiles = []
     seen_urls = set()
@@ -165,10 +165,16 @@ async def reverse_photo_search(image_url: str) -> dict:
 
 
 def _detect_platform(url: str) -> str | None:
-    url_lower = url.lower()
-    for domain, platform in DOMAIN_PLATFORM_MAP.items():
-        if domain in url_lower:
+    """Platform for the URL's host or its closest listed parent domain (m.facebook.com -> Facebook)."""
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return None
+    while host:
+        platform = DOMAIN_PLATFORM_MAP.get(host)
+        if platform:
             return platform
+        host = host.partition(".")[2]
     return None
 
 
@@ -3,11 +3,40 @@ import re
 import logging
 from app.models import ReferenceContact, BackgroundCheckRequest, ResumeData
 from app.config import settings
-from app.utils.http import get_client
+from app.utils.serpapi import serpapi_search
 
 logger = logging.getLogger(__name__)
 
-SERPAPI_BASE = "https://serpapi.com/search.json"
+# "John Doe - Senior Manager - Company | LinkedIn"
+_LINKEDIN_SUFFIX_RE = re.compile(r'\s*[\|–\-]\s*LinkedIn.*$', re.IGNORECASE)
+_TITLE_SEP_RE = re.compile(r'\s*[\|–\-]\s*')
+
+# Job-title keyword -> department search terms, in priority order
+_DEPT_MAP = {
+    "engineer": "Engineer OR Developer OR Software",
+    "developer": "Engineer OR Developer OR Software",
+    "software": "Engineer OR Developer OR Software",
+    "data": "Data OR Analytics OR ML",
+    "design": "Design OR UX OR UI",
+    "product": "Product OR PM",
+    "market": "Marketing OR Growth",
+    "sales": "Sales OR Business Development",
+    "finance": "Finance OR Accounting",
+    "legal": "Legal OR Compliance",
+    "ops": "Operations OR DevOps OR SRE",
+    "devops": "Operations OR DevOps OR SRE",
+    "security": "Security OR InfoSec OR Cybersecurity",
+    "research": "Research OR Scientist OR R&D",
+    "machine learning": "ML OR AI OR Machine Learning",
+    "frontend": "Frontend OR React OR UI",
+    "backend": "Backend OR API OR Server",
+    "fullstack": "Full Stack OR Fullstack OR Developer",
+    "full stack": "Full Stack OR Fullstack OR Developer",
+    "python": "Python OR Backend OR Developer",
+}
+_DEPT_PRIORITY = {keyword: i for i, keyword in enumerate(_DEPT_MAP)}
+# Lookahead so overlapping keywords ("opsoftware") are all found
+_DEPT_RE = re.compile("(?=(" + "|".join(re.escape(k) for k in sorted(_DEPT_MAP, key=len, reverse=True)) + "))")
 
 
 async def discover_references(
@@ -25,14 +54,16 @@ async def discover_references(
 
     # Collect all companies + roles
     companies = []
+    seen_companies: set[str] = set()  # lower-cased, so "Acme" and "acme" count once
     if request.company:
         companies.append({"company": request.company, "title": request.title or ""})
+        seen_companies.add(request.company.lower())
     if resume:
         for exp in resume.experience:
             co = exp.get("company", "").strip()
-            title = exp.get("title", "").strip()
-            if co and co not in [c["company"] for c in companies]:
-                companies.append({"company": co, "title": title})
+            if co and co.lower() not in seen_companies:
+                seen_companies.add(co.lower())
+                companies.append({"company": co, "title": exp.get("title", "").strip()})
 
     if not companies:
         return []
@@ -67,8 +98,8 @@ async def _find_contacts_at_company(
     person_title: str,
 ) -> list[ReferenceContact]:
     """Find HR, managers, and colleagues at a specific company."""
-    client = get_client()
     contacts = []
+    seen_urls: set[str] = set()
 
     # Build multiple targeted queries
     queries = [
@@ -94,25 +125,23 @@ async def _find_contacts_at_company(
 
     person_first = person_name.split()[0].lower()
 
-    for query, category in queries:
-        params = {
-            "engine": "google",
-            "q": query,
-            "num": 5,
-            "api_key": settings.serpapi_api_key,
-        }
-        resp = await client.get(SERPAPI_BASE, params=params)
-        if resp.status_code != 200:
+    # Independent searches: run together (serpapi.com concurrency is capped in the HTTP client)
+    responses = await asyncio.gather(
+        *(serpapi_search({"engine": "google", "q": query, "num": 5}) for query, _ in queries),
+        return_exceptions=True,
+    )
+    for (_, category), data in zip(queries, responses):
+        if not isinstance(data, dict):
             continue
 
-        data = resp.json()
         for item in data.get("organic_results", []):
             url = item.get("link", "")
             title = item.get("title", "")
             snippet = item.get("snippet", "")
 
-            if "linkedin.com/in/" not in url:
+            if "linkedin.com/in/" not in url or url in seen_urls:
                 continue
+            seen_urls.add(url)  # first (most specific) category wins
 
             # Skip the person themselves
             if person_first in title.lower().split(" - ")[0].lower():
@@ -138,8 +167,8 @@ async def _find_contacts_at_company(
 def _parse_linkedin_title(title: str) -> tuple[str, str]:
     """Parse 'John Doe - Senior Manager - Company | LinkedIn' into (name, role)."""
     # Remove " | LinkedIn" suffix
-    title = re.sub(r'\s*[\|–\-]\s*LinkedIn.*$', '', title, flags=re.IGNORECASE)
-    parts = [p.strip() for p in re.split(r'\s*[\|–\-]\s*', title) if p.strip()]
+    title = _LINKEDIN_SUFFIX_RE.sub('', title)
+    parts = [p.strip() for p in _TITLE_SEP_RE.split(title) if p.strip()]
     if not parts:
         return ("", "")
     name = parts[0]
@@ -149,33 +178,8 @@ def _parse_linkedin_title(title: str) -> tuple[str, str]:
 
 def _extract_department(title: str) -> str | None:
     """Extract department/function keywords from a job title."""
-    title_lower = title.lower()
-
-    dept_map = {
-        "engineer": "Engineer OR Developer OR Software",
-        "developer": "Engineer OR Developer OR Software",
-        "software": "Engineer OR Developer OR Software",
-        "data": "Data OR Analytics OR ML",
-        "design": "Design OR UX OR UI",
-        "product": "Product OR PM",
-        "market": "Marketing OR Growth",
-        "sales": "Sales OR Business Development",
-        "finance": "Finance OR Accounting",
-        "legal": "Legal OR Compliance",
-        "ops": "Operations OR DevOps OR SRE",
-        "devops": "Operations OR DevOps OR SRE",
-        "security": "Security OR InfoSec OR Cybersecurity",
-        "research": "Research OR Scientist OR R&D",
-        "machine learning": "ML OR AI OR Machine Learning",
-        "frontend": "Frontend OR React OR UI",
-        "backend": "Backend OR API OR Server",
-        "fullstack": "Full Stack OR Fullstack OR Developer",
-        "full stack": "Full Stack OR Fullstack OR Developer",
-        "python": "Python OR Backend OR Developer",
-    }
-
-    for keyword, dept_query in dept_map.items():
-        if keyword in title_lower:
-            return dept_query
-
-    return None
+    # Every keyword in one scan; on several hits the earliest table entry wins, as before
+    matches = _DEPT_RE.findall(title.lower())
+    if not matches:
+        return None
+    return _DEPT_MAP[min(matches, key=_DEPT_PRIORITY.__getitem__)]
@@ -1,17 +1,25 @@
-import json
+import asyncio
+import io
 import logging
-import tempfile
+import threading
 from pathlib import Path
 
+import orjson
 import pdfplumber
+import pypdfium2 as pdfium
 from docx import Document
+from pydantic import ValidationError
 
 from app.models import ResumeData
 from app.config import settings
 from app.utils.http import get_client
+from app.llm.nvidia import llm_slots
 
 logger = logging.getLogger(__name__)
 
+# PDFium isn't thread-safe, and parsing runs in worker threads
+_pdfium_lock = threading.Lock()
+
 EXTRACT_PROMPT = """\
 You are a resume parsing expert. Extract structured information from the following resume text.
 
@@ -40,39 +48,47 @@ async def parse_resume_file(file_bytes: bytes, filename: str) -> str:
     """Extract raw text from a PDF or DOCX file."""
     suffix = Path(filename).suffix.lower()
 
+    # Parsing is CPU-bound (hundreds of ms for a long PDF); keep it off the event loop
     if suffix == ".pdf":
-        return _parse_pdf(file_bytes)
+        return await asyncio.to_thread(_parse_pdf, file_bytes)
     elif suffix in (".docx", ".doc"):
-        return _parse_docx(file_bytes)
+        return await asyncio.to_thread(_parse_docx, file_bytes)
     else:
         # Try as plain text
         return file_bytes.decode("utf-8", errors="ignore")
 
 
 def _parse_pdf(file_bytes: bytes) -> str:
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as tmp:
-        tmp.write(file_bytes)
-        tmp.flush()
-        text_parts = []
-        with pdfplumber.open(tmp.name) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-        return "\n\n".join(text_parts)
+    """Extract text with PDFium (C++, fast); fall back to pdfplumber if it finds none."""
+    try:
+        with _pdfium_lock, pdfium.PdfDocument(file_bytes) as pdf:
+            text_parts = [page.get_textpage().get_text_range().strip() for page in pdf]
+        text = "\n\n".join(t for t in text_parts if t).replace("\r\n", "\n")
+    except pdfium.PdfiumError as e:
+        logger.info("PDFium could not read resume, trying pdfplumber: %s", e)
+        text = ""
+    return text or _parse_pdf_plumber(file_bytes)
+
+
+def _parse_pdf_plumber(file_bytes: bytes) -> str:
+    text_parts = []
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text_parts.append(page_text)
+    return "\n\n".join(text_parts)
 
 
 def _parse_docx(file_bytes: bytes) -> str:
-    with tempfile.NamedTemporaryFile(suffix=".docx", delete=True) as tmp:
-        tmp.write(file_bytes)
-        tmp.flush()
-        doc = Document(tmp.name)
-        return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+    doc = Document(io.BytesIO(file_bytes))
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
 
 
 async def extract_resume_data(raw_text: str) -> ResumeData:
     """Use NVIDIA LLM to extract structured data from resume text."""
     client = get_client()
+    stored_text = raw_text[:5000]  # kept on ResumeData on every path
 
     payload = {
         "model": settings.nvidia_model,
@@ -85,42 +101,33 @@ async def extract_resume_data(raw_text: str) -> ResumeData:
         "response_format": {"type": "json_object"},
     }
 
-    resp = await client.post(
-        f"{settings.nvidia_base_url}/chat/completions",
-        json=payload,
-        headers={
-            "Authorization": f"Bearer {settings.nvidia_api_key}",
-            "Content-Type": "application/json",
-        },
-        timeout=45,
-    )
+    async with llm_slots:
+        resp = await client.post(
+            f"{settings.nvidia_base_url}/chat/completions",
+            content=orjson.dumps(payload),
+            headers={
+                "Authorization": f"Bearer {settings.nvidia_api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=45,
+        )
 
     if resp.status_code != 200:
-        logger.error("Resume extraction LLM error %d: %s", resp.status_code, resp.text[:300])
-        return ResumeData(raw_text=raw_text[:5000])
+        logger.error(
+            "Resume extraction LLM error %d: %s", resp.status_code, resp.content[:300].decode("utf-8", "replace"),
+        )
+        return ResumeData(raw_text=stored_text)
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     content = data["choices"][0]["message"]["content"]
 
     try:
-        parsed = json.loads(content)
-        return ResumeData(
-            name=parsed.get("name"),
-            email=parsed.get("email"),
-            phone=parsed.get("phone"),
-            location=parsed.get("location"),
-            title=parsed.get("title"),
-            company=parsed.get("company"),
-            linkedin_url=parsed.get("linkedin_url"),
-            github_url=parsed.get("github_url"),
-            website=parsed.get("website"),
-            skills=parsed.get("skills", []),
-            experience=parsed.get("experience", []),
-            education=parsed.get("education", []),
-            certifications=parsed.get("certifications", []),
-            key_search_terms=parsed.get("key_search_terms", []),
-            raw_text=raw_text[:5000],
-        )
-    except (json.JSONDecodeError, KeyError) as e:
+        parsed = orjson.loads(content)
+        if not isinstance(parsed, dict):
+            raise TypeError(f"expected a JSON object, got {type(parsed).__name__}")
+        # Nulls fall back to the field defaults; unknown keys are ignored
+        fields = {k: v for k, v in parsed.items() if v is not None}
+        return ResumeData.model_validate({**fields, "raw_text": stored_text})
+    except (TypeError, ValueError, ValidationError) as e:  # orjson.JSONDecodeError is a ValueError
         logger.warning("Failed to parse resume LLM output: %s", e)
-        return ResumeData(raw_text=raw_text[:5000])
+        return ResumeData(raw_text=stored_text)
@@ -1,13 +1,14 @@
 import asyncio
 import logging
+import re
+from collections.abc import Container
 from app.models import SocialProfile, BackgroundCheckRequest
+from app.models_internal import SocialProfileRaw
 from app.config import settings
-from app.utils.http import get_client
+from app.utils.serpapi import serpapi_search
 
 logger = logging.getLogger(__name__)
 
-SERPAPI_BASE = "https://serpapi.com/search.json"
-
 # Grouped into batches — each batch becomes ONE Google search with OR operators
 PLATFORM_BATCHES = [
     {
@@ -72,104 +73,146 @@ PLATFORM_BATCHES = [
 ]
 
 
+def _check_unique_sites(batches: list[dict]) -> None:
+    """Fail at import if a site is listed twice, which would double its searches and matches."""
+    owner: dict[str, str] = {}
+    for batch in batches:
+        for platform, sites in batch["platforms"].items():
+            for site in sites:
+                key = site.replace("*.", "").lower()
+                if key in owner:
+                    raise ValueError(f"PLATFORM_BATCHES lists {site!r} for both {owner[key]} and {platform}")
+                owner[key] = platform
+
+
+def _compile_batch(batch: dict) -> dict:
+    """Precompute a batch's site: query and the regex that maps a URL to its platform.
+
+    The regex is one alternation, longest site first, so a URL is matched in a
+    single scan and e.g. twitter.com wins over x.com at the same position.
+    """
+    pairs = [(site, platform) for platform, sites in batch["platforms"].items() for site in sites]
+    site_to_platform = {site.replace("*.", "").lower(): platform for site, platform in pairs}
+    return {
+        **batch,
+        "site_query": " OR ".join(f"site:{site}" for site, _ in pairs),
+        "site_re": re.compile("|".join(map(re.escape, sorted(site_to_platform, key=len, reverse=True)))),
+        "site_to_platform": site_to_platform,
+    }
+
+
+# Only the fields we read; SerpAPI trims the rest of the response server-side.
+_RESULT_FIELDS = "organic_results[].{link,title,snippet}"
+
+_check_unique_sites(PLATFORM_BATCHES)
+_BATCHES = [_compile_batch(b) for b in PLATFORM_BATCHES]
+
+_scan_inflight: dict[str, asyncio.Task] = {}
+
+
 async def scan_social_media(request: BackgroundCheckRequest) -> list[SocialProfile]:
-    """Search for the person across 29 platforms using batched Google queries."""
-    if not settings.serpapi_api_key:
-        return []
+    """Search for the person across 29 platforms using batched Google queries.
 
+    Concurrent scans for the same name share one run.
+    """
     name = request.name
+    if not settings.serpapi_api_key or not name.split():
+        return []
 
-    # Run all batches concurrently — NO company in social queries (people don't use it)
-    coros = [_search_batch(name, batch) for batch in PLATFORM_BATCHES]
-    results = await asyncio.gather(*coros, return_exceptions=True)
+    key = " ".join(name.lower().split())
+    task = _scan_inflight.get(key)
+    if task is None:
+        task = _scan_inflight[key] = asyncio.create_task(_scan(name))
+        task.add_done_callback(lambda _: _scan_inflight.pop(key, None))
+    # Shielded so one caller giving up doesn't cancel the scan for the others;
+    # each caller gets its own list.
+    return list(await asyncio.shield(task))
 
-    profiles = []
-    seen_urls = set()
-    for r in results:
-        if isinstance(r, list):
-            for p in r:
-                if p.url not in seen_urls:
-                    seen_urls.add(p.url)
-                    profiles.append(p)
 
-    # If first pass found very little, retry key platforms with relaxed (unquoted) name
-    if len(profiles) < 2:
-        retry_profiles = await _retry_key_platforms(name)
-        for p in retry_profiles:
-            if p.url not in seen_urls:
-                seen_urls.add(p.url)
-                profiles.append(p)
+async def _scan(name: str) -> list[SocialProfile]:
+    by_url: dict[str, SocialProfileRaw] = {}  # first-seen order, first copy of each URL wins
 
-    return profiles
+    def _collect(results: list) -> None:
+        for r in results:
+            if isinstance(r, list):
+                for p in r:
+                    by_url.setdefault(p.url, p)
+
+    # Run all batches concurrently — NO company in social queries (people don't use it)
+    _collect(await asyncio.gather(*(_search_batch(name, batch) for batch in _BATCHES), return_exceptions=True))
 
+    # If first pass found very little, retry key platforms with relaxed (unquoted) name
+    if len(by_url) < 2:
+        _collect([await _retry_key_platforms(name, by_url)])
+
+    return [p.to_model() for p in by_url.values()]
 
-async def _search_batch(name: str, batch: dict) -> list[SocialProfile]:
-    """Search one batch of platforms — uses just the person's name, no company."""
-    all_sites = []
-    site_to_platform = {}
-    for platform, sites in batch["platforms"].items():
-        for site in sites:
-            all_sites.append(site)
-            site_to_platform[site] = platform
 
-    site_query = " OR ".join(f"site:{s}" for s in all_sites)
+async def _search_batch(name: str, batch: dict) -> list[SocialProfileRaw]:
+    """Search one compiled batch of platforms — uses just the person's name, no company.
 
-    # Try exact name first, then parts
+    The exact name is tried first, then (names with 2+ parts only) first+last
+    without quotes if that found nothing.
+    """
+    site_query = batch["site_query"]
     name_parts = name.strip().split()
-    queries = [
-        f'({site_query}) "{name}"',  # exact full name
-    ]
-    # If name has 2+ parts, also try first+last without quotes
-    if len(name_parts) >= 2:
-        queries.append(f'({site_query}) {name_parts[0]} {name_parts[-1]}')
+    name_re = _name_re(name_parts)
 
-    client = get_client()
-    profiles = []
-    name_lower_parts = [p.lower() for p in name_parts]
-
-    for query in queries:
-        params = {
-            "engine": "google",
-            "q": query,
-            "num": 10,
-            "api_key": settings.serpapi_api_key,
-        }
-        resp = await client.get(SERPAPI_BASE, params=params)
-        if resp.status_code != 200:
-            continue
+    async def search(q: str) -> list[SocialProfileRaw]:
+        data = await serpapi_search({"engine": "google", "q": q, "num": 10, "json_restrictor": _RESULT_FIELDS})
+        return _batch_profiles(data, batch, name_re) if data is not None else []
 
-        data = resp.json()
-        for item in data.get("organic_results", []):
-            url = item.get("link", "")
-            title = item.get("title", "")
-            snippet = item.get("snippet", "")
-            text = f"{title} {snippet}".lower()
+    exact_q = f'({site_query}) "{name}"'
+    if len(name_parts) < 2:
+        return await search(exact_q)
+    if not _is_rare_name(name_parts):
+        return await search(exact_q) or await search(f"({site_query}) {name_parts[0]} {name_parts[-1]}")
 
-            # Relevance: at least first name OR last name must appear
-            if not any(part in text for part in name_lower_parts):
-                continue
+    # The exact query usually misses for these, so start the relaxed one alongside it
+    relaxed = asyncio.create_task(search(f"({site_query}) {name_parts[0]} {name_parts[-1]}"))
+    try:
+        return await search(exact_q) or await relaxed
+    finally:
+        relaxed.cancel()
 
-            platform = _match_platform(url, site_to_platform, all_sites)
-            if not platform:
-                continue
 
-            username = _extract_username(url, platform)
-            profiles.append(SocialProfile(
-                platform=platform,
-                url=url,
-                username=username,
-                snippet=snippet[:200] if snippet else title[:200],
-            ))
+def _is_rare_name(name_parts: list[str]) -> bool:
+    """Names that rarely appear verbatim in results: 3+ parts, hyphenated or non-ASCII."""
+    return len(name_parts) >= 3 or any("-" in p or not p.isascii() for p in name_parts)
+
+
+def _name_re(name_parts: list[str]) -> re.Pattern:
+    """Case-insensitive pattern matching any one part of the name."""
+    return re.compile("|".join(map(re.escape, name_parts)), re.IGNORECASE)
+
+
+def _batch_profiles(data: dict, batch: dict, name_re: re.Pattern) -> list[SocialProfileRaw]:
+    site_re = batch["site_re"]
+    site_to_platform = batch["site_to_platform"]
+    profiles = []
+    for item in data.get("organic_results", []):
+        url = item.get("link", "")
+        title = item.get("title", "")
+        snippet = item.get("snippet", "")
+
+        # Relevance: at least first name OR last name must appear
+        if not (name_re.search(title) or name_re.search(snippet)):
+            continue
 
-        # If first query (exact name) got results, skip the relaxed query
-        if profiles:
-            break
+        platform = _match_platform(url.lower(), site_re, site_to_platform)
+        if not platform:
+            continue
 
+        username = _extract_username(url, platform)
+        profiles.append(SocialProfileRaw(platform, url, username, snippet[:200] if snippet else title[:200]))
     return profiles
 
 
-async def _retry_key_platforms(name: str) -> list[SocialProfile]:
-    """Retry individual searches on the most important platforms with relaxed queries."""
+async def _retry_key_platforms(name: str, seen_urls: Container[str]) -> list[SocialProfileRaw]:
+    """Retry individual searches on the most important platforms with relaxed queries.
+
+    URLs in `seen_urls` are skipped, since the caller already has them.
+    """
     key_platforms = [
         ("Twitter/X", "twitter.com"),
         ("Instagram", "instagram.com"),
@@ -178,37 +221,32 @@ async def _retry_key_platforms(name: str) -> list[SocialProfile]:
         ("Medium", "medium.com"),
     ]
 
-    async def _search_single(platform: str, site: str) -> list[SocialProfile]:
-        client = get_client()
-        name_parts = name.strip().split()
+    name_parts = name.strip().split()
+    name_re = _name_re(name_parts)
+
+    async def _search_single(platform: str, site: str) -> list[SocialProfileRaw]:
         # Very broad: just first + last name, no quotes
         q = f"site:{site} {name_parts[0]}"
         if len(name_parts) > 1:
             q += f" {name_parts[-1]}"
 
-        params = {"engine": "google", "q": q, "num": 5, "api_key": settings.serpapi_api_key}
-        resp = await client.get(SERPAPI_BASE, params=params)
-        if resp.status_code != 200:
+        data = await serpapi_search({"engine": "google", "q": q, "num": 5, "json_restrictor": _RESULT_FIELDS})
+        if data is None:
             return []
 
         results = []
-        name_lower = [p.lower() for p in name_parts]
-        for item in resp.json().get("organic_results", []):
+        for item in data.get("organic_results", []):
             url = item.get("link", "")
             title = item.get("title", "")
             snippet = item.get("snippet", "")
-            text = f"{title} {snippet}".lower()
 
-            if not any(p in text for p in name_lower):
+            if not (name_re.search(title) or name_re.search(snippet)):
                 continue
-            if site not in url:
+            if site not in url or url in seen_urls:
                 continue
 
             username = _extract_username(url, platform)
-            results.append(SocialProfile(
-                platform=platform, url=url, username=username,
-                snippet=snippet[:200] if snippet else title[:200],
-            ))
+            results.append(SocialProfileRaw(platform, url, username, snippet[:200] if snippet else title[:200]))
         return results
 
     coros = [_search_single(p, s) for p, s in key_platforms]
@@ -221,50 +259,75 @@ async def _retry_key_platforms(name: str) -> list[SocialProfile]:
     return profiles
 
 
-def _match_platform(url: str, site_to_platform: dict, all_sites: list) -> str | None:
-    url_lower = url.lower()
-    for site in all_sites:
-        clean_site = site.replace("*.", "")
-        if clean_site in url_lower:
-            return site_to_platform.get(site)
+def _match_platform(url_lower: str, site_re: re.Pattern, site_to_platform: dict[str, str]) -> str | None:
+    m = site_re.search(url_lower)
+    return site_to_platform[m.group()] if m else None
+
+
+def _username_default(parts: list[str]) -> str | None:
+    last = parts[-1] if parts else None
+    if last and "." not in last and last not in ("profile", "users", "user", "u"):
+        return last
     return None
 
 
+def _username_last(parts: list[str]) -> str | None:
+    return parts[-1]
+
+
+def _username_handle(parts: list[str]) -> str | None:
+    """First `@handle` path segment, if any."""
+    return next((p for p in parts if p.startswith("@")), None)
+
+
+def _username_stackoverflow(parts: list[str]) -> str | None:
+    idx = parts.index("users")
+    return parts[idx + 2] if len(parts) > idx + 2 else parts[idx + 1]
+
+
+def _username_medium(parts: list[str]) -> str | None:
+    return _username_handle(parts) or (parts[-1] if parts[-1] not in ("medium.com", "") else None)
+
+
+def _username_reddit(parts: list[str]) -> str | None:
+    if "user" in parts:
+        idx = parts.index("user")
+        return parts[idx + 1] if len(parts) > idx + 1 else None
+    return _username_default(parts)
+
+
+def _username_figma(parts: list[str]) -> str | None:
+    return _username_handle(parts) or _username_default(parts)
+
+
+def _username_youtube(parts: list[str]) -> str | None:
+    handle = _username_handle(parts)
+    if handle:
+        return handle
+    if "channel" in parts or "c" in parts:
+        return parts[-1]
+    return _username_default(parts)
+
+
+# Platform -> extractor over the URL's non-empty path parts; anything else uses the default.
+_USERNAME_EXTRACTORS = {
+    "Stack Overflow": _username_stackoverflow,
+    "Medium": _username_medium,
+    "Reddit": _username_reddit,
+    "Google Scholar": lambda parts: None,
+    "LeetCode": _username_last,
+    "HackerRank": _username_last,
+    "Codeforces": _username_last,
+    "HuggingFace": _username_last,
+    "Figma": _username_figma,
+    "YouTube": _username_youtube,
+    "CodePen": _username_last,
+}
+
+
 def _extract_username(url: str, platform: str) -> str | None:
+    parts = [p for p in url.rstrip("/").split("/") if p]
     try:
-        parts = url.rstrip("/").split("/")
-        parts = [p for p in parts if p]
-
-        if "stackoverflow" in url:
-            idx = parts.index("users")
-            return parts[idx + 2] if len(parts) > idx + 2 else parts[idx + 1]
-        elif "medium.com" in url:
-            for p in parts:
-                if p.startswith("@"):
-                    return p
-            return parts[-1] if parts[-1] not in ("medium.com", "") else None
-        elif "reddit.com" in url:
-            if "user" in parts:
-                idx = parts.index("user")
-                return parts[idx + 1] if len(parts) > idx + 1 else None
-        elif "scholar.google" in url:
-            return None
-        elif "leetcode.com" in url or "hackerrank.com" in url or "codeforces.com" in url:
-            return parts[-1]
-        elif "huggingface.co" in url:
-            return parts[-1]
-        elif "figma.com" in url or "youtube.com" in url:
-            for p in parts:
-                if p.startswith("@"):
-                    return p
-            if "youtube.com" in url and ("channel" in parts or "c" in parts):
-                return parts[-1]
-        elif "codepen.io" in url:
-            return parts[-1]
-
-        last = parts[-1] if parts else None
-        if last and "." not in last and last not in ("profile", "users", "user", "u"):
-            return last
-        return None
+        return _USERNAME_EXTRACTORS.get(platform, _username_default)(parts)
     except (ValueError, IndexError):
         return None
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire `ttl` seconds after being set.
+
+    Only touched from the event loop thread and never awaits, so no lock is needed.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class SWRCache:
+    """TTL cache for async lookups with stale-while-revalidate.
+
+    Fresh hits return immediately. Hits up to `stale` seconds past `ttl` also
+    return immediately and refresh in the background, within `timeout` seconds.
+    Concurrent misses for a key share one factory call. `None` results are not
+    cached so a failed lookup is retried next time.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600, stale: float = 86400):
+        self.ttl = ttl
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl + stale)
+        self._loading: dict[Hashable, asyncio.Task] = {}
+        self._refreshing: set[Hashable] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_or_fetch(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]], timeout: float | None = None,
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl and key not in self._refreshing:
+                self._refreshing.add(key)
+                task = asyncio.create_task(self._refresh(key, factory, timeout))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return value
+        task = self._loading.get(key)
+        if task is None:
+            task = self._loading[key] = asyncio.create_task(self._load(key, factory))
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        # Shielded so one caller giving up doesn't cancel the lookup for the others.
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        value = await factory()
+        if value is not None:
+            self._entries.set(key, (time.monotonic(), value))
+        return value
+
+    async def _refresh(self, key: Hashable, factory: Callable[[], Awaitable[Any]], timeout: float | None) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                await self._load(key, factory)
+        except TimeoutError:
+            logger.warning("Background refresh of %r timed out", key)
+        except Exception:  # any factory error; the stale value keeps being served
+            logger.warning("Background refresh of %r failed", key, exc_info=True)
+        finally:
+            self._refreshing.discard(key)
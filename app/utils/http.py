@@ -1,20 +1,148 @@
+import asyncio
+import logging
+import random
+import time
+
 import httpx
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 _client: httpx.AsyncClient | None = None
 
+# Concurrent requests allowed per upstream host; anything else uses the default.
+_HOST_LIMITS = {
+    "serpapi.com": settings.serpapi_max_concurrency,
+    "api.github.com": 10,
+    "integrate.api.nvidia.com": 10,
+}
+# Requests per second allowed per paid/ban-prone API host, on top of the concurrency cap.
+_HOST_RATES = {
+    "serpapi.com": settings.serpapi_rate_limit,
+    "nubela.co": 2.0,
+    settings.rapidapi_host: 10.0,
+}
+_RETRY_STATUSES = frozenset({429, 502, 503, 504, 999})  # 999: LinkedIn's "slow down"
+_RETRY_METHODS = frozenset({"GET", "HEAD"})
+_RETRY_ATTEMPTS = 3
+_BACKOFF_BASE = 0.25
+_BACKOFF_MAX = 4.0
+
+
+class _RateLimit:
+    """Spaces calls at least 1/rate seconds apart (event-loop only, so no lock)."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        start = max(now, self._next)
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class _SlotStream(httpx.AsyncByteStream):
+    """Response body that gives its host slot back once the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, sem: asyncio.Semaphore):
+        self._stream = stream
+        self._sem = sem
+        self._held = True
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._held:
+                self._held = False
+                self._sem.release()
+
+
+class _ThrottledTransport(httpx.AsyncBaseTransport):
+    """Caps concurrency (and for some hosts, rate) per host and retries
+    throttled/unavailable idempotent requests.
+
+    A slot is held until the response is closed, so body downloads and
+    `client.stream()` reads count against the cap too.
+
+    Backoff is exponential with jitter and honours a numeric `Retry-After`
+    (capped at `_BACKOFF_MAX`). Non-idempotent requests are never retried.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, default_limit: int):
+        self._inner = inner
+        self._default_limit = default_limit
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._rates = {host: _RateLimit(rate) for host, rate in _HOST_RATES.items() if rate > 0}
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        sem = self._slots.get(host)
+        if sem is None:
+            sem = self._slots[host] = asyncio.Semaphore(_HOST_LIMITS.get(host, self._default_limit))
+        return sem
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        sem = self._slot(host)
+        rate = self._rates.get(host)
+        retryable = request.method in _RETRY_METHODS
+        attempt = 0
+        while True:
+            if rate:
+                await rate.wait()
+            await sem.acquire()
+            try:
+                resp = await self._inner.handle_async_request(request)
+            except BaseException:
+                sem.release()
+                raise
+            if resp.is_closed:  # body already read in full
+                sem.release()
+            else:
+                resp.stream = _SlotStream(resp.stream, sem)
+            attempt += 1
+            if not retryable or resp.status_code not in _RETRY_STATUSES or attempt >= _RETRY_ATTEMPTS:
+                return resp
+            await resp.aclose()
+            delay = _backoff(attempt, resp.headers.get("Retry-After"))
+            logger.info("%s returned %d, retrying in %.2fs", host, resp.status_code, delay)
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _backoff(attempt: int, retry_after: str | None) -> float:
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), _BACKOFF_MAX)
+    return min(_BACKOFF_BASE * 2 ** (attempt - 1), _BACKOFF_MAX) + random.uniform(0, _BACKOFF_BASE)
+
 
 def get_client() -> httpx.AsyncClient:
     global _client
     if _client is None:
-        _client = httpx.AsyncClient(
-            timeout=httpx.Timeout(settings.request_timeout),
-            follow_redirects=True,
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=2,  # connection failures only; status retries happen in _ThrottledTransport
             limits=httpx.Limits(
-                max_connections=settings.max_concurrency * 2,
-                max_keepalive_connections=settings.max_concurrency,
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
             ),
         )
+        _client = httpx.AsyncClient(
+            transport=_ThrottledTransport(transport, default_limit=settings.max_concurrency * 2),
+            timeout=httpx.Timeout(settings.request_timeout, connect=5.0),
+            headers={"User-Agent": "backgrounder/0.1"},
+            follow_redirects=True,
+        )
     return _client
 
 
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from typing import Any
+
+import orjson
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.http import get_client
+
+logger = logging.getLogger(__name__)
+
+SERPAPI_BASE = "https://serpapi.com/search.json"
+
+_cache = TTLCache(maxsize=2048, ttl=settings.serpapi_cache_ttl)
+_inflight: dict[tuple[bool, tuple], asyncio.Task] = {}
+
+
+async def serpapi_search(params: dict[str, Any], cache: bool = True) -> dict | None:
+    """Run a SerpAPI search (the API key is added here) and return the parsed JSON.
+
+    Returns None if SerpAPI doesn't answer 200. Identical searches within
+    SERPAPI_CACHE_TTL come from memory and concurrent ones share one request,
+    so callers must treat the result as read-only. `cache=False` is for callers
+    that cache their own, derived result; they share requests only with each other.
+    """
+    key = tuple(sorted(params.items()))
+    if cache:
+        data = _cache.get(key)
+        if data is not None:
+            return data
+    flight = (cache, key)  # a cache=False search must neither join nor feed a caching one
+    task = _inflight.get(flight)
+    if task is None:
+        task = _inflight[flight] = asyncio.create_task(_fetch(key, params, cache))
+        task.add_done_callback(lambda _: _inflight.pop(flight, None))
+    # Shielded so one caller giving up doesn't cancel the search for the others.
+    return await asyncio.shield(task)
+
+
+async def _fetch(key: tuple, params: dict[str, Any], cache: bool) -> dict | None:
+    resp = await get_client().get(SERPAPI_BASE, params={**params, "api_key": settings.serpapi_api_key})
+    if resp.status_code != 200:
+        logger.warning(
+            "SerpAPI %s search failed for %r: %d %s", params.get("engine"), params.get("q") or params.get("url"),
+            resp.status_code, resp.content[:200].decode("utf-8", "replace"),
+        )
+        return None
+    data = orjson.loads(resp.content)
+    if cache and settings.serpapi_cache_ttl:
+        _cache.set(key, data)
+    return data
@@ -150,6 +150,10 @@ function handleStatus(data, feed, bar, text) {
         iconEl.innerHTML = `<svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="#34d399" stroke-width="3"><polyline points="20 6 9 17 4 12"/></svg>`;
         statusEl.textContent = detail || "done";
         statusEl.style.color = "#34d399";
+      } else if (state === "skipped") {
+        iconEl.innerHTML = `<svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="#9ca3af" stroke-width="3"><line x1="5" y1="12" x2="19" y2="12"/></svg>`;
+        statusEl.textContent = detail || "skipped";
+        statusEl.style.color = "#9ca3af";
       } else {
         iconEl.innerHTML = `<svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="#f87171" stroke-width="3"><line x1="18" y1="6" x2="6" y2="18"/><line x1="6" y1="6" x2="18" y2="18"/></svg>`;
         statusEl.textContent = "failed";